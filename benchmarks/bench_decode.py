@@ -0,0 +1,108 @@
+"""Compare the legacy multi-decode path with a single shared LoadedImage.
+
+Legacy: process_images decodes the file, extract_text_from_image decodes it
+again and copies it with np.array, and the manual tools decode it a third time
+before rendering. Shared: one load_image() whose ``array`` feeds OCR.
+
+Each variant runs in a fresh subprocess so its peak RSS can be compared.
+
+    python benchmarks/bench_decode.py [image.png] [--repeat 3]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from translate_images.image_io import load_image
+
+
+def make_scan(path, width=6000, height=8000):
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, width, dtype=np.uint8)
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[:] = gradient[None, :, None]
+    noise = rng.integers(0, 16, size=(height, width, 1), dtype=np.uint8)
+    pixels += noise
+    Image.fromarray(pixels).save(path)
+
+
+def legacy(path):
+    image = Image.open(path).convert("RGB")
+    image_np = np.array(Image.open(path).convert("RGB"))
+    render_image = Image.open(path).convert("RGB")
+    return image, image_np, render_image
+
+
+def shared(path):
+    loaded = load_image(path)
+    return loaded, loaded.array
+
+
+def run_variant(name, path, repeat):
+    variant = {"legacy": legacy, "shared": shared}[name]
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = variant(path)
+        timings.append(time.perf_counter() - start)
+        del result
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps(
+            {
+                "variant": name,
+                "best_seconds": min(timings),
+                # ru_maxrss is in KiB on Linux
+                "peak_rss_mib": (peak - baseline) / 1024,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("image", nargs="?", help="image to decode (default: synthetic 6000x8000 PNG)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--variant", choices=("legacy", "shared"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.image, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.image
+        if path is None:
+            path = str(Path(tmp) / "scan.png")
+            make_scan(path)
+        rows = []
+        for name in ("legacy", "shared"):
+            output = subprocess.run(
+                [sys.executable, __file__, path, "--repeat", str(args.repeat), "--variant", name],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            rows.append(json.loads(output))
+
+    for row in rows:
+        print(f"{row['variant']:>7}: {row['best_seconds']:.3f}s  peak +{row['peak_rss_mib']:.0f} MiB")
+    legacy_row, shared_row = rows
+    print(
+        f"saved: {legacy_row['best_seconds'] - shared_row['best_seconds']:.3f}s, "
+        f"{legacy_row['peak_rss_mib'] - shared_row['peak_rss_mib']:.0f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
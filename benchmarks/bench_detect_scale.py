@@ -0,0 +1,103 @@
+"""Compare full-resolution OCR with detection on a downscaled image.
+
+For every sample image, ``readtext`` at full resolution is the reference.
+Each factor reports its OCR time, the speedup and the box recall: the share of
+reference boxes matched (IoU >= 0.5) by a box from the two-resolution read.
+The OCR cache is bypassed. Needs easyocr.
+
+    python benchmarks/bench_detect_scale.py [data_jp] [--factor 2 --factor 4]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from translate_images.batch import IMAGE_EXTENSIONS
+from translate_images.image_io import load_image
+from translate_images.ocr import readtext, warm_up
+from translate_images.ocr_downscale import read_text_downscaled
+
+MATCH_IOU = 0.5
+
+
+def bounds(box):
+    xs = [point[0] for point in box]
+    ys = [point[1] for point in box]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def iou(a, b):
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union
+
+
+def matched(reference, candidates):
+    candidates = [bounds(box) for box, _, _ in candidates]
+    return sum(
+        any(iou(bounds(box), candidate) >= MATCH_IOU for candidate in candidates)
+        for box, _, _ in reference
+    )
+
+
+def timed(read):
+    start = time.perf_counter()
+    results = read()
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("samples", nargs="?", default="data_jp", help="directory of sample images")
+    parser.add_argument("--factor", type=float, action="append", help="downscale factor (default: 2 and 4)")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many images")
+    args = parser.parse_args()
+    factors = args.factor or [2.0, 4.0]
+
+    paths = sorted(
+        path for path in Path(args.samples).rglob("*") if path.suffix.lower() in IMAGE_EXTENSIONS
+    )[: args.limit]
+    if not paths:
+        parser.error(f"no images found in {args.samples}")
+
+    warm_up()
+    totals = {"full": {"seconds": 0.0, "boxes": 0}}
+    totals.update({factor: {"seconds": 0.0, "boxes": 0, "matched": 0} for factor in factors})
+    for path in paths:
+        loaded = load_image(path)
+        reference, seconds = timed(lambda: readtext(loaded.array, detail=1, paragraph=False))
+        totals["full"]["seconds"] += seconds
+        totals["full"]["boxes"] += len(reference)
+        row = {"image": str(path), "full_seconds": seconds, "full_boxes": len(reference)}
+        for factor in factors:
+            results, seconds = timed(
+                lambda: read_text_downscaled(loaded, factor, detail=1, paragraph=False)
+            )
+            hits = matched(reference, results)
+            totals[factor]["seconds"] += seconds
+            totals[factor]["boxes"] += len(results)
+            totals[factor]["matched"] += hits
+            row[f"x{factor:g}"] = {"seconds": seconds, "boxes": len(results), "matched": hits}
+        print(json.dumps(row))
+
+    full = totals["full"]
+    print(f"{len(paths)} image(s), full resolution: {full['seconds']:.2f}s, {full['boxes']} box(es)")
+    for factor in factors:
+        total = totals[factor]
+        speedup = full["seconds"] / total["seconds"] if total["seconds"] else 0.0
+        recall = total["matched"] / full["boxes"] if full["boxes"] else 1.0
+        print(
+            f"  detect at 1/{factor:g}: {total['seconds']:.2f}s ({speedup:.2f}x), "
+            f"{total['boxes']} box(es), recall {recall:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Per-box cost of font fitting: legacy 1-point walk vs cached binary search.
+
+    python benchmarks/bench_fonts.py [--font /path/to/font.ttf] [--boxes 200]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import ImageFont
+
+from translate_images.fonts import FontManager, load_font
+
+
+def legacy_estimate_font_size(box, text, font_path):
+    x1, y1 = box[0]
+    x2, y2 = box[2]
+    base_font_size = max(int((y2 - y1) * 0.8), 8)
+    font = ImageFont.truetype(font_path, base_font_size)
+    while font.getbbox(text)[2] > (x2 - x1) and base_font_size > 8:
+        base_font_size -= 1
+        font = ImageFont.truetype(font_path, base_font_size)
+    return font
+
+
+def make_boxes(count, seed=0):
+    rng = random.Random(seed)
+    words = ["Settings", "Cancel", "Download the latest version", "OK", "Account details", "Next"]
+    boxes = []
+    for _ in range(count):
+        x, y = rng.randint(0, 1500), rng.randint(0, 900)
+        width, height = rng.randint(40, 400), rng.randint(14, 90)
+        box = [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+        boxes.append((box, rng.choice(words)))
+    return boxes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--font", help="font file (default: first font of the fallback chain)")
+    parser.add_argument("--boxes", type=int, default=200)
+    args = parser.parse_args()
+
+    manager = FontManager([args.font] if args.font else None)
+    if manager.path is None:
+        sys.exit("No TrueType font found, pass --font")
+    boxes = make_boxes(args.boxes)
+
+    start = time.perf_counter()
+    for box, text in boxes:
+        legacy_estimate_font_size(box, text, manager.path)
+    legacy_seconds = time.perf_counter() - start
+
+    load_font.cache_clear()
+    start = time.perf_counter()
+    for box, text in boxes:
+        manager.fit(box, text)
+    cold_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for box, text in boxes:
+        manager.fit(box, text)
+    warm_seconds = time.perf_counter() - start
+
+    for name, seconds in (("legacy", legacy_seconds), ("cold cache", cold_seconds), ("warm cache", warm_seconds)):
+        print(f"{name:>10}: {seconds / len(boxes) * 1e3:.3f} ms/box")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Outlined text on a black background: legacy offset loop vs one stroked draw.
+
+    python benchmarks/bench_outline.py [--font path.ttf] [--size 32] [--repeat 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from translate_images.fonts import FontManager
+from translate_images.render import add_text_outline
+
+
+def legacy_add_text_outline(draw, text, position, font, color, outline_color, outline_width=2):
+    x, y = position
+    for offset in range(-outline_width, outline_width + 1):
+        draw.text((x + offset, y), text, font=font, fill=outline_color)
+        draw.text((x, y + offset), text, font=font, fill=outline_color)
+        draw.text((x + offset, y + offset), text, font=font, fill=outline_color)
+        draw.text((x + offset, y - offset), text, font=font, fill=outline_color)
+        draw.text((x - offset, y + offset), text, font=font, fill=outline_color)
+    draw.text((x, y), text, font=font, fill=color)
+
+
+def render(outline, font, text, repeat):
+    image = Image.new("RGB", (900, 120), (0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outline(draw, text, (20, 30), font, (255, 255, 255), (255, 255, 255), 2)
+    return image, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--font", help="font file (default: first font of the fallback chain)")
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--save", help="directory to write both renderings to")
+    args = parser.parse_args()
+
+    font = FontManager([args.font] if args.font else None).get(args.size)
+    text = "Download the latest version"
+    legacy_image, legacy_seconds = render(legacy_add_text_outline, font, text, args.repeat)
+    stroke_image, stroke_seconds = render(add_text_outline, font, text, args.repeat)
+
+    legacy_ink = np.asarray(legacy_image).any(axis=2)
+    stroke_ink = np.asarray(stroke_image).any(axis=2)
+    overlap = (legacy_ink & stroke_ink).sum() / max((legacy_ink | stroke_ink).sum(), 1)
+
+    print(f"legacy: {legacy_seconds * 1e3:.3f} ms/box")
+    print(f"stroke: {stroke_seconds * 1e3:.3f} ms/box ({legacy_seconds / stroke_seconds:.1f}x faster)")
+    print(f"inked pixels in common (IoU): {overlap:.2%}")
+    if args.save:
+        legacy_image.save(Path(args.save) / "outline_legacy.png")
+        stroke_image.save(Path(args.save) / "outline_stroke.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Translation throughput against the local fake server.
+
+Compares the legacy pattern (a fresh connection per request, one request at a
+time, like one GoogleTranslator per call) with the pooled asyncio HttpBackend
+at several concurrency limits.
+
+    python benchmarks/bench_translators.py --requests 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from translate_images.fake_translate_server import FakeTranslateServer
+from translate_images.translators import HttpBackend
+
+
+def legacy(url, texts):
+    for text in texts:
+        request = urllib.request.Request(
+            url + "/translate",
+            data=json.dumps({"q": text, "source": "ja", "target": "en"}).encode(),
+            headers={"Content-Type": "application/json", "Connection": "close"},
+        )
+        with urllib.request.urlopen(request) as response:
+            json.load(response)
+
+
+async def pooled(url, texts, in_flight):
+    backend = HttpBackend(url, max_connections=in_flight, max_in_flight=in_flight)
+    try:
+        results = await backend.translate_many(texts)
+    finally:
+        await backend.aclose()
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        raise errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    texts = [f"テキスト {index}" for index in range(args.requests)]
+    rows = []
+    with FakeTranslateServer(latency=args.latency) as server:
+        start = time.perf_counter()
+        legacy(server.url, texts)
+        rows.append({"variant": "legacy", "seconds": time.perf_counter() - start})
+        for in_flight in args.concurrency:
+            start = time.perf_counter()
+            asyncio.run(pooled(server.url, texts, in_flight))
+            rows.append({"variant": f"pooled x{in_flight}", "seconds": time.perf_counter() - start})
+
+    for row in rows:
+        row["requests_per_second"] = args.requests / row["seconds"]
+        print(f"{row['variant']:>11}: {row['seconds']:.2f}s  {row['requests_per_second']:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
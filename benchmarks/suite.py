@@ -0,0 +1,228 @@
+"""Reproducible benchmark of the OCR -> translate -> erase -> render pipeline.
+
+Synthetic pages (a seeded gradient with Japanese lines drawn on it) are
+generated for every resolution x text density scenario and run through
+``translate_images.auto_translate.process_images``. OCR returns the boxes the
+page was drawn with and translation is the offline fake translator, so the
+numbers measure this repository's code, not EasyOCR or the network;
+``--real-ocr`` runs the EasyOCR reader instead (without the OCR cache).
+
+The median seconds of every stage (decode, ocr, translate, erase, render,
+encode) and of the whole image are written as JSON. With ``--baseline`` a
+previous JSON file is compared and the exit status is 1 when any stage got
+slower than ``--threshold`` (relative) and ``--min-delta`` (absolute).
+
+    python benchmarks/suite.py --output bench.json
+    python benchmarks/suite.py --baseline bench.json --threshold 0.25
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "4k": (3840, 2160)}
+# Text lines per page
+DENSITIES = {"sparse": 4, "medium": 20, "dense": 60}
+PHRASES = (
+    "こんにちは",
+    "ダウンロード",
+    "設定を保存しました",
+    "次のページへ進む",
+    "ログインしてください",
+    "最新バージョン",
+    "お問い合わせ",
+    "利用規約に同意する",
+)
+CJK_FONTS = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/fonts-japanese-gothic.ttf",
+    "C:/Windows/Fonts/msgothic.ttc",
+    "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",
+)
+TEXT_SIZE = 28
+
+
+def cjk_font(path=None):
+    for candidate in ([path] if path else []) + list(CJK_FONTS):
+        try:
+            return ImageFont.truetype(candidate, TEXT_SIZE)
+        except OSError:
+            continue
+    # Japanese glyphs render as boxes, which still gives the stages pixels to work on
+    return ImageFont.load_default(TEXT_SIZE)
+
+
+def make_page(width, height, lines, font, seed):
+    """Return a page and the ``[(box, text, confidence), ...]`` drawn on it."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    base = rng.integers(120, 220, size=3)
+    pixels = np.stack(
+        [base[0] + 30 * x + 0 * y, base[1] + 30 * y + 0 * x, base[2] - 20 * (x + y)], axis=2
+    )
+    page = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    draw = ImageDraw.Draw(page)
+    detections = []
+    for _ in range(lines):
+        text = PHRASES[int(rng.integers(len(PHRASES)))]
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        left_edge = int(rng.integers(0, max(width - right, 1)))
+        top_edge = int(rng.integers(0, max(height - bottom, 1)))
+        draw.text((left_edge, top_edge), text, font=font, fill=(20, 20, 20))
+        box = [
+            [left_edge + left, top_edge + top],
+            [left_edge + right, top_edge + top],
+            [left_edge + right, top_edge + bottom],
+            [left_edge + left, top_edge + bottom],
+        ]
+        detections.append((box, text, 0.99))
+    return page, detections
+
+
+def run_scenarios(args, workdir):
+    # Caches live in the scratch directory so runs never warm each other up
+    os.environ["TRANSLATE_IMAGES_CACHE_DIR"] = str(workdir / "cache")
+    from translate_images import auto_translate
+    from translate_images import ocr
+    from translate_images.fake_translate_server import fake_translate
+
+    truth = {}
+    if args.real_ocr:
+        ocr.warm_up()
+
+        def read_text(image, **kwargs):
+            return [tuple(result) for result in ocr.readtext(image.array, **kwargs)]
+    else:
+
+        def read_text(image, **kwargs):
+            return truth[str(image.path)]
+
+    auto_translate.read_text_cached = read_text
+    auto_translate.translate_text = lambda text, src_lang="ja", dest_lang="en", counters=None: fake_translate(
+        text, dest_lang
+    )
+
+    font = cjk_font(args.font)
+    results = {}
+    for resolution in args.resolution:
+        width, height = RESOLUTIONS[resolution]
+        for density in args.density:
+            name = f"{resolution}-{density}"
+            input_path = workdir / f"{name}.{args.format}"
+            output_path = workdir / f"{name}-out.{args.format}"
+            page, detections = make_page(width, height, DENSITIES[density], font, args.seed)
+            page.save(input_path)
+            truth[str(input_path)] = detections
+
+            samples = {}
+            for _ in range(args.repeat):
+                # The per-box log lines would be mixed with the JSON on stdout
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    report = auto_translate.process_images(input_path, output_path)
+                    samples.setdefault("total", []).append(time.perf_counter() - start)
+                for stage, seconds in report.stage_seconds.items():
+                    samples.setdefault(stage, []).append(seconds)
+            results[name] = {stage: statistics.median(values) for stage, values in samples.items()}
+            print(
+                f"{name:>14}: "
+                + ", ".join(f"{stage} {seconds * 1e3:.1f}ms" for stage, seconds in results[name].items()),
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Return a line per stage slower than the baseline by both margins."""
+    regressions = []
+    for scenario, stages in results.items():
+        for stage, seconds in stages.items():
+            before = baseline.get(scenario, {}).get(stage)
+            if before is None:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > min_delta:
+                regressions.append(
+                    f"{scenario} {stage}: {before * 1e3:.1f}ms -> {seconds * 1e3:.1f}ms "
+                    f"(+{(seconds / before - 1) if before else float('inf'):.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", action="append", choices=sorted(RESOLUTIONS), help="default: all")
+    parser.add_argument("--density", action="append", choices=sorted(DENSITIES), help="default: all")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario, the median is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("png", "jpg"), default="png")
+    parser.add_argument("--font", help="CJK font to draw the pages with")
+    parser.add_argument("--real-ocr", action="store_true", help="run EasyOCR instead of the stub")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown of a stage counted as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.002,
+        help="slowdowns below this many seconds are noise (default: 0.002)",
+    )
+    args = parser.parse_args()
+    args.resolution = args.resolution or list(RESOLUTIONS)
+    args.density = args.density or list(DENSITIES)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_scenarios(args, Path(tmp))
+
+    import PIL
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pillow": PIL.__version__,
+            "ocr": "easyocr" if args.real_ocr else "stub",
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "format": args.format,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline["meta"].get("ocr") != report["meta"]["ocr"]:
+            print("Warning: the baseline was recorded with a different OCR mode", file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.threshold, args.min_delta)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No stage slower than the baseline by more than {args.threshold:.0%}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+import json
+import threading
+
+from translate_images.corrections_store import CorrectionsStore, corrections_version
+
+
+def test_put_many_updates_entries_and_version(tmp_path):
+    store = CorrectionsStore(tmp_path / "corrections.sqlite3", json_path=None)
+    assert store.version == 0
+    store.put_many({"猫": "cat", "犬": "dog"})
+    store.put("猫", "kitty")
+    assert store.get("猫") == "kitty"
+    assert store.get("鳥", "bird") == "bird"
+    assert len(store) == 2
+    assert store.version == 2
+    store.close()
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    json_path = tmp_path / "corrections.json"
+    json_path.write_text(json.dumps({"猫": "cat", "犬": "dog"}), encoding="utf-8")
+    db_path = tmp_path / "corrections.sqlite3"
+
+    store = CorrectionsStore(db_path, json_path)
+    store.put("猫", "kitty")
+    store.close()
+    # Reopening must not import the file again over the newer correction
+    store = CorrectionsStore(db_path, json_path)
+    assert store.get("猫") == "kitty"
+    assert store.get("犬") == "dog"
+    assert store.import_json(json_path) == 0
+    assert store.version == 2
+    store.close()
+    assert corrections_version(db_path, json_path) == "store:2"
+
+
+def test_concurrent_stores_import_once_and_keep_every_write(tmp_path):
+    json_path = tmp_path / "corrections.json"
+    json_path.write_text(json.dumps({"猫": "cat"}), encoding="utf-8")
+    db_path = tmp_path / "corrections.sqlite3"
+    errors = []
+
+    def reviewer(number):
+        try:
+            store = CorrectionsStore(db_path, json_path)
+            for page in range(10):
+                store.put_many({f"{number}-{page}-{line}": "ok" for line in range(5)})
+            store.close()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reviewer, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    store = CorrectionsStore(db_path, json_path)
+    assert len(store) == 1 + 4 * 10 * 5
+    # One import plus one version per submitted page
+    assert store.version == 1 + 4 * 10
+    store.close()
@@ -0,0 +1,61 @@
+import numpy as np
+
+from translate_images import ocr_tiling
+from translate_images.ocr_tiling import iter_tiles, merge_detections, read_text_tiled
+
+
+def rect(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+# Two tiles side by side overlapping on x 80..100
+TILES = [(0, 0, 100, 50), (80, 0, 180, 50)]
+
+
+def test_line_cut_by_the_border_keeps_the_larger_box():
+    partial = (rect(60, 10, 100, 20), "こんに", 0.9)
+    whole = (rect(60, 10, 140, 20), "こんにちは", 0.8)
+    assert merge_detections([[partial], [whole]], TILES) == [whole]
+
+
+def test_distinct_boxes_in_the_overlap_are_kept():
+    first = (rect(82, 10, 98, 15), "上", 0.9)
+    second = (rect(82, 30, 98, 35), "下", 0.9)
+    assert merge_detections([[first], [second]], TILES) == [first, second]
+
+
+def test_overlapping_boxes_of_one_tile_are_not_merged():
+    large = (rect(10, 10, 50, 30), "大", 0.9)
+    small = (rect(15, 15, 30, 25), "小", 0.9)
+    assert merge_detections([[large, small], []], TILES) == [large, small]
+
+
+def test_boxes_away_from_the_overlap_are_not_compared():
+    left = (rect(10, 10, 50, 30), "左", 0.9)
+    # Same coordinates reported by the other tile, but outside the band they share
+    right = (rect(10, 10, 50, 30), "右", 0.9)
+    assert len(merge_detections([[left], [right]], TILES)) == 2
+
+
+def test_tile_boxes_are_shifted_to_image_coordinates(monkeypatch):
+    width, height, tile_size, overlap = 300, 200, 128, 32
+    tiles = list(iter_tiles(width, height, tile_size, overlap))
+    assert tiles[-1][2:] == (width, height)
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+    # Mark every tile's top-left pixel with its index so the fake reader knows where it is
+    for index, (x0, y0, _, _) in enumerate(tiles):
+        pixels[y0, x0, 0] = index + 1
+
+    def fake_readtext(tile, languages, reader_options, slot, **kwargs):
+        index = int(tile[0, 0, 0]) - 1
+        # A box touching the right and bottom borders of the tile
+        h, w = tile.shape[:2]
+        return [(rect(w - 10, h - 10, w, h), str(index), 0.9)]
+
+    monkeypatch.setattr(ocr_tiling, "readtext", fake_readtext)
+    for workers in (1, 3):
+        results = read_text_tiled(pixels, tile_size, overlap, workers)
+        by_tile = {int(text): box for box, text, _ in results}
+        assert len(by_tile) == len(tiles)
+        for index, (_, _, x1, y1) in enumerate(tiles):
+            assert by_tile[index] == rect(x1 - 10, y1 - 10, x1, y1)
@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+from translate_images.pipeline import Pipeline, Stage
+
+
+def test_items_error_is_raised_instead_of_hanging():
+    def items():
+        yield 1
+        raise OSError("listing failed")
+
+    pipeline = Pipeline([Stage("double", lambda value: value * 2, workers=2)])
+    results = []
+    failure = []
+
+    def consume():
+        try:
+            results.extend(pipeline.stream(items()))
+        except OSError as e:
+            failure.append(e)
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    consumer.join(timeout=10)
+    assert not consumer.is_alive()
+    assert [result.value for result in results] == [2]
+    assert str(failure[0]) == "listing failed"
+
+
+def test_stage_error_marks_only_its_item():
+    def check(value):
+        if value == 2:
+            raise ValueError("bad")
+        return value
+
+    results = Pipeline([Stage("check", check), Stage("keep", lambda value: value)]).run([1, 2, 3])
+    assert [result.value for result in results] == [1, 2, 3]
+    assert [result.error for result in results] == [None, "check: ValueError: bad", None]
@@ -0,0 +1,64 @@
+import cProfile
+import pstats
+import time
+
+from translate_images.profiling import MAX_STACKS, collapsed_stacks
+
+
+class FakeStats:
+    """The ``stats`` mapping of a ``pstats.Stats``, built by hand."""
+
+    def __init__(self, entries):
+        self.stats = entries
+
+
+def layered_profile(layers, width, own):
+    """Every function of a layer calls every function of the next: ``width ** layers`` paths."""
+    root = ("app.py", 1, "main")
+    names = [
+        [("app.py", 100 * (layer + 1) + index, f"f{layer}_{index}") for index in range(width)]
+        for layer in range(layers)
+    ]
+    entries = {}
+    cumulative = 0.0
+    for layer in reversed(range(layers)):
+        # Each function of this layer runs its own time plus one share of every callee
+        cumulative += own
+        callers = names[layer - 1] if layer else [root]
+        edge = (1, 1, own / len(callers), cumulative / len(callers))
+        for func in names[layer]:
+            entries[func] = (1, 1, own, cumulative, dict.fromkeys(callers, edge))
+    entries[root] = (1, 1, own, own + width * cumulative, {})
+    return FakeStats(entries)
+
+
+def folded_seconds(stats):
+    return sum(microseconds for _, microseconds in collapsed_stacks(stats)) / 1e6
+
+
+def test_dense_call_graph_is_bounded_and_adds_up():
+    stats = layered_profile(layers=12, width=8, own=0.01)
+    total = sum(entry[2] for entry in stats.stats.values())
+
+    start = time.perf_counter()
+    stacks = list(collapsed_stacks(stats))
+    assert time.perf_counter() - start < 10
+    # Expanded paths, plus functions the walk never reached
+    assert len(stacks) <= MAX_STACKS + len(stats.stats)
+    assert abs(sum(microseconds for _, microseconds in stacks) / 1e6 - total) < 1e-6
+
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def test_recursive_profile_adds_up():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    fibonacci(18)
+    sorted(range(1000), key=str)
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+    total = sum(entry[2] for entry in stats.stats.values())
+
+    assert abs(folded_seconds(stats) - total) < 1e-6
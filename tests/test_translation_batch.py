@@ -0,0 +1,34 @@
+from translate_images.translation_batch import BatchTranslator
+
+
+class MemoryCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, text, src_lang, dest_lang):
+        return self.entries.get(text)
+
+    def put_many(self, pairs, src_lang, dest_lang):
+        self.entries.update(pairs)
+
+
+def test_one_failed_string_keeps_the_rest_of_its_chunk():
+    def fetch(text, src_lang, dest_lang):
+        if "\n" in text:
+            # Lines merged by the provider: forces the per-string fallback
+            return "merged"
+        if text == "失敗":
+            raise RuntimeError("boom")
+        return f"<{text}>"
+
+    cache = MemoryCache()
+    translator = BatchTranslator(fetch, cache=cache)
+    fetched = set()
+    resolved = translator.resolve(["一", "失敗", "二"], fetched)
+
+    assert resolved == {"一": "<一>", "二": "<二>"}
+    assert cache.entries == resolved
+    assert fetched == {"一", "二"}
+    stats = translator.stats()
+    assert stats["failures"] == 1
+    assert stats["requests"] == 4
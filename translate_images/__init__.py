@@ -0,0 +1,8 @@
+"""Shared building blocks for the image translation tools.
+
+The tools themselves are ``auto_translate`` (batch translation) and ``manual``
+(review by hand), run with ``python -m translate_images translate|correct|remove``
+or through the ``auto_translate.py``, ``manual_correction.py`` and
+``manual_remove.py`` scripts. Expensive state (OCR models, caches) lives in one
+place here, and nothing is loaded until a command needs it.
+"""
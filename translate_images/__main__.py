@@ -0,0 +1,4 @@
+from translate_images.cli import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
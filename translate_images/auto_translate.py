@@ -0,0 +1,774 @@
+import argparse
+import contextlib
+import os
+import time
+from pathlib import Path
+from PIL import ImageDraw
+import re
+from translate_images.batch import ImageReport, ImageResult, format_stage_seconds, iter_image_jobs, run_batch
+from translate_images.boxes import make_text_boxes
+from translate_images.corrections_store import corrections_version
+from translate_images.fonts import FONT_ENV, configure_fonts, estimate_font_size, get_font_manager, reset_font_manager
+from translate_images.image_io import copy_unchanged, load_image, save_image
+from translate_images.inpaint import (
+    ERASE_METHOD_ENV,
+    ERASE_METHODS,
+    ERASE_TIGHTEN_ENV,
+    configure_erase,
+    erase_settings_from_env,
+)
+from translate_images.manifest import IncrementalRun, Manifest
+from translate_images.metrics import COUNTERS, MetricsRecorder
+from translate_images.ocr import DEFAULT_LANGUAGES, format_reader_stats, warm_up
+from translate_images.ocr_cache import get_ocr_cache, read_text_cached
+from translate_images.ocr_downscale import DETECT_SCALE_ENV, configure_detect_scale, detect_scale_from_env
+from translate_images.ocr_tiling import (
+    DEFAULT_TILE_OVERLAP,
+    DEFAULT_TILE_WORKERS,
+    TILE_OVERLAP_ENV,
+    TILE_SIZE_ENV,
+    TILE_WORKERS_ENV,
+    configure_tiling,
+    tiling_from_env,
+)
+from translate_images.pipeline import Pipeline, Stage
+from translate_images.profiling import (
+    PROFILE_DIR_ENV,
+    PROFILE_EVERY_ENV,
+    configure_profiling,
+    profile_image,
+    write_report,
+)
+from translate_images.render import (
+    FILL_SPOTS_COLOR_ENV,
+    FILL_SPOTS_TOLERANCE_ENV,
+    SPOT_COLOR,
+    add_text_outline,
+    configure_fill_spots,
+    erase_text,
+    fill_color_spots,
+    fill_spots_from_env,
+)
+from translate_images.translation_batch import BatchTranslator
+from translate_images.translation_cache import get_translation_cache, normalize_text
+from translate_images.translators import (
+    BACKENDS,
+    TRANSLATOR_ENV,
+    TRANSLATOR_URL_ENV,
+    configure_backend,
+    get_backend,
+    reset_backend,
+)
+from translate_images.watch import DEFAULT_SETTLE_SECONDS, watch_directory
+
+# Set by --hardlink-unchanged and --quiet; read from the environment so workers inherit them
+HARDLINK_UNCHANGED_ENV = "TRANSLATE_IMAGES_HARDLINK_UNCHANGED"
+QUIET_ENV = "TRANSLATE_IMAGES_QUIET"
+
+def log_boxes():
+    return not os.environ.get(QUIET_ENV)
+
+def contains_japanese(text):
+    return bool(re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]', text))
+
+def extract_text_from_image(image):
+    # Look the image up in the OCR cache, otherwise run the shared easyocr reader
+    results = read_text_cached(image, detail=1, paragraph=False)
+    text_and_boxes = [(text, box) for box, text, _ in results]
+    
+    return text_and_boxes
+
+def fetch_translation(text, src_lang, dest_lang):
+    return get_backend().translate(text, src_lang, dest_lang)
+
+def translate_text(text, src_lang='ja', dest_lang='en', counters=None):
+    fetch = fetch_translation
+    if counters is not None:
+        # Count the lookups of this image and the ones the cache could not answer
+        counters["translation_lookups"] += 1
+
+        def fetch(text, src_lang, dest_lang):
+            counters["translation_calls"] += 1
+            return fetch_translation(text, src_lang, dest_lang)
+    try:
+        return get_translation_cache().translate(text, fetch, src_lang, dest_lang)
+    except Exception as e:
+        print(f"Translation error: {e}")
+        return text
+
+def clean_translated_text(special_chars, translated_text):
+    if len(special_chars) == 2:
+        return f"{special_chars[0]}{translated_text}{special_chars[1]}".strip()
+    return translated_text.strip()
+
+def adjust_text_color(bg_color):
+    r, g, b = bg_color
+    if (r*0.299 + g*0.587 + b*0.114) < 128:
+        return (255, 255, 255)
+    return (0, 0, 0)
+
+class ImageTask:
+    """State of one image as it moves through the stages below."""
+
+    def __init__(self, input_image_path, output_image_path):
+        self.input_image_path = input_image_path
+        self.output_image_path = output_image_path
+        self.loaded = None
+        self.text_and_boxes = []
+        self.boxes = []
+        # No Japanese text found: the input bytes are copied to the output as is
+        self.unchanged = False
+        self.stage_seconds = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @property
+    def status(self):
+        return "unchanged" if self.unchanged else "translated"
+
+    def report(self):
+        return ImageReport(self.status, self.stage_seconds, self.counters)
+
+def decode_stage(task):
+    if not os.path.isfile(task.input_image_path):
+        raise FileNotFoundError(f"The file {task.input_image_path} does not exist.")
+
+    task.loaded = load_image(task.input_image_path)
+    return task
+
+def ocr_stage(task):
+    task.text_and_boxes = extract_text_from_image(task.loaded)
+
+    if log_boxes():
+        print("Textes extraits et leurs boîtes de délimitation :")
+        for text, box in task.text_and_boxes:
+            print(f"Texte : {text} | Boîte : {box}")
+
+    # Background colors of all Japanese boxes, sampled once before erasing
+    task.boxes = make_text_boxes(
+        task.loaded.array,
+        [(text, box) for text, box in task.text_and_boxes if contains_japanese(text)],
+    )
+    # Erase and render draw on the PIL image; the pixel copy is no longer needed
+    task.loaded.release_array()
+    task.unchanged = not task.boxes
+    task.counters["boxes"] = len(task.boxes)
+    return task
+
+def translate_stage(task):
+    for text_box in task.boxes:
+        text_box.translation = translate_text(text_box.text.strip(), counters=task.counters)
+    return task
+
+def erase_stage(task):
+    method, tighten = erase_settings_from_env()
+    task.loaded.image = erase_text(
+        task.loaded.image,
+        [text_box.box for text_box in task.boxes],
+        [text_box.bg_color for text_box in task.boxes],
+        method,
+        tighten,
+    )
+    return task
+
+def cleanup_stage(task):
+    # Only in the stage list when --fill-spots is given, see active_stages()
+    target, tolerance = fill_spots_from_env()
+    task.loaded.image = fill_color_spots(task.loaded.image, target, tolerance)
+    return task
+
+def render_stage(task):
+    image = task.loaded.image
+    draw = ImageDraw.Draw(image)
+
+    for text_box in task.boxes:
+        translated_text = text_box.translation
+        bg_color = text_box.bg_color
+        text_color = adjust_text_color(bg_color)
+
+        font = estimate_font_size(text_box.box, translated_text)
+        if font is None:
+            continue
+
+        if bg_color == (0, 0, 0):
+            add_text_outline(draw, translated_text, text_box.position, font, text_color, (255, 255, 255))
+        else:
+            draw.text(text_box.position, translated_text, font=font, fill=text_color)
+
+        if log_boxes():
+            print(f"Texte original : {text_box.text} | Texte traduit : {translated_text} | Couleur de fond : {bg_color} | Couleur du texte : {text_color}")
+
+    task.loaded.image = image
+    return task
+
+def encode_stage(task):
+    save_image(task.loaded.image, task.output_image_path)
+    task.counters["bytes_written"] = os.path.getsize(task.output_image_path)
+    # Release the pixels as soon as they are written
+    task.loaded = None
+    return task
+
+def copy_stage(task):
+    copy_unchanged(
+        task.input_image_path,
+        task.output_image_path,
+        hardlink=bool(os.environ.get(HARDLINK_UNCHANGED_ENV)),
+    )
+    task.counters["bytes_written"] = os.path.getsize(task.output_image_path)
+    task.loaded = None
+    return task
+
+# What replaces a stage once ocr_stage found no Japanese text (None skips it)
+UNCHANGED_STAGES = {
+    "translate": None,
+    "erase": None,
+    "cleanup": None,
+    "render": None,
+    "encode": ("copy", copy_stage),
+}
+
+def timed_stage(name, stage):
+    """Wrap ``stage`` to add its duration to ``task.stage_seconds``."""
+    def run(task):
+        if task.unchanged and name in UNCHANGED_STAGES:
+            if UNCHANGED_STAGES[name] is None:
+                return task
+            label, func = UNCHANGED_STAGES[name]
+        else:
+            label, func = name, stage
+        start = time.perf_counter()
+        task = func(task)
+        task.stage_seconds[label] = task.stage_seconds.get(label, 0.0) + time.perf_counter() - start
+        return task
+    return run
+
+STAGES = tuple(
+    (name, timed_stage(name, stage))
+    for name, stage in (
+        ("decode", decode_stage),
+        ("ocr", ocr_stage),
+        ("translate", translate_stage),
+        ("erase", erase_stage),
+        ("cleanup", cleanup_stage),
+        ("render", render_stage),
+        ("encode", encode_stage),
+    )
+)
+
+def active_stages():
+    """STAGES without the optional ones that are turned off for this run."""
+    if fill_spots_from_env() is None:
+        return tuple((name, stage) for name, stage in STAGES if name != "cleanup")
+    return STAGES
+
+def process_images(input_image_path, output_image_path):
+    task = ImageTask(input_image_path, output_image_path)
+    # A no-op unless --profile sampled this image
+    with profile_image(input_image_path):
+        for _, stage in active_stages():
+            task = stage(task)
+    return task.report()
+
+def run_pipeline(jobs, stage_workers, queue_size=4, on_result=None):
+    """Stream ``jobs`` through the stages, each with its own thread pool."""
+    stages = [
+        Stage(name, stage, workers=stage_workers.get(name, 1)) for name, stage in active_stages()
+    ]
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+    for result in Pipeline(stages, queue_size=queue_size).stream(
+        ImageTask(input_path, output_path) for input_path, output_path in jobs
+    ):
+        input_path, output_path = jobs[result.index]
+        task = result.value
+        results[result.index] = ImageResult(
+            input_path,
+            output_path,
+            result.error is None,
+            result.error,
+            result.seconds,
+            "failed" if result.error is not None else task.status,
+            task.stage_seconds if task is not None else None,
+            task.counters if task is not None else None,
+        )
+        if on_result is not None:
+            on_result(results[result.index])
+    return results
+
+def run_windowed(jobs, window, batch_translator, on_result=None):
+    """Translate the deduplicated strings of ``window`` images at a time.
+
+    Every image of a window is decoded and OCR'd first, the window's Japanese
+    strings are resolved with batched requests, then the images are rendered
+    from the resolved map. ``window=0`` treats the whole tree as one window
+    (all decoded images stay in memory until it is rendered).
+    """
+    jobs = list(jobs)
+    size = window or max(len(jobs), 1)
+    stages = active_stages()
+    results = []
+    for start in range(0, len(jobs), size):
+        tasks = []
+        errors = {}
+        timings = {}
+        for input_path, output_path in jobs[start : start + size]:
+            task = ImageTask(input_path, output_path)
+            tasks.append(task)
+            began = time.perf_counter()
+            try:
+                for name, stage in stages:
+                    if name in ("decode", "ocr"):
+                        stage(task)
+            except Exception as e:
+                errors[id(task)] = f"{type(e).__name__}: {e}"
+            timings[id(task)] = time.perf_counter() - began
+
+        ready = [task for task in tasks if id(task) not in errors]
+        began = time.perf_counter()
+        fetched = set()
+        resolved = batch_translator.resolve(
+            (text_box.text.strip() for task in ready for text_box in task.boxes), fetched
+        )
+        # The batched requests serve the whole window; share their time out
+        translating = [task for task in ready if not task.unchanged]
+        for task in translating:
+            task.stage_seconds["translate"] = (time.perf_counter() - began) / len(translating)
+
+        for task in tasks:
+            began = time.perf_counter()
+            if id(task) not in errors:
+                try:
+                    # A string the batch sent to the translator counts as one call
+                    # for each image using it, as translate_text counts it
+                    called = set()
+                    for text_box in task.boxes:
+                        text_box.translation = batch_translator.lookup(resolved, text_box.text.strip())
+                        if text_box.translation is None:
+                            text_box.translation = translate_text(text_box.text.strip(), counters=task.counters)
+                            continue
+                        task.counters["translation_lookups"] += 1
+                        key = normalize_text(text_box.text.strip())
+                        if key in fetched and key not in called:
+                            called.add(key)
+                            task.counters["translation_calls"] += 1
+                    for name, stage in stages:
+                        if name not in ("decode", "ocr", "translate"):
+                            stage(task)
+                except Exception as e:
+                    errors[id(task)] = f"{type(e).__name__}: {e}"
+            task.loaded = None
+            error = errors.get(id(task))
+            seconds = timings[id(task)] + time.perf_counter() - began
+            result = ImageResult(
+                task.input_image_path,
+                task.output_image_path,
+                error is None,
+                error,
+                seconds,
+                task.status if error is None else "failed",
+                task.stage_seconds,
+                task.counters,
+            )
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+    return results
+
+def run_config():
+    """Settings that change the rendered output, recorded in the run manifest."""
+    backend = get_backend()
+    return {
+        "languages": list(DEFAULT_LANGUAGES),
+        "ocr_tiling": list(tiling_from_env()[:2]),
+        "ocr_detect_scale": detect_scale_from_env(),
+        "erase": list(erase_settings_from_env()),
+        "fill_spots": fill_spots_from_env(),
+        "font": get_font_manager().path,
+        "translator": backend.name,
+        "translator_url": getattr(backend, "url", None),
+    }
+
+# Environment variables that carry the settings of a run to the worker processes
+RUN_SETTINGS_ENV = (
+    TILE_SIZE_ENV,
+    TILE_OVERLAP_ENV,
+    TILE_WORKERS_ENV,
+    DETECT_SCALE_ENV,
+    ERASE_METHOD_ENV,
+    ERASE_TIGHTEN_ENV,
+    FILL_SPOTS_COLOR_ENV,
+    FILL_SPOTS_TOLERANCE_ENV,
+    HARDLINK_UNCHANGED_ENV,
+    QUIET_ENV,
+    PROFILE_DIR_ENV,
+    PROFILE_EVERY_ENV,
+    FONT_ENV,
+    TRANSLATOR_ENV,
+    TRANSLATOR_URL_ENV,
+)
+
+@contextlib.contextmanager
+def run_settings():
+    """Give the settings environment back as it was, once a run is over.
+
+    The font manager and translator backend built from it are dropped too,
+    so a later ``main`` call in the same process starts from the same state.
+    """
+    saved = {name: os.environ.get(name) for name in RUN_SETTINGS_ENV}
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        reset_font_manager()
+        reset_backend()
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Translate the Japanese text of every image in a directory tree."
+    )
+    parser.add_argument("--input", default="data_jp", help="input directory (default: data_jp)")
+    parser.add_argument("--output", default="data_en", help="output directory (default: data_en)")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="number of worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="torch/OpenMP threads per worker (default: CPU count / workers)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="overlap decode, OCR, translation, rendering and encoding across images",
+    )
+    for stage, default in (
+        ("decode", 1),
+        ("ocr", 1),
+        ("translate", 8),
+        ("erase", 1),
+        ("cleanup", 1),
+        ("render", 1),
+        ("encode", 2),
+    ):
+        parser.add_argument(
+            f"--{stage}-workers",
+            type=int,
+            default=default,
+            help=f"threads for the {stage} stage in --pipeline mode (default: {default})",
+        )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=4,
+        help="images allowed to wait between two stages in --pipeline mode (default: 4)",
+    )
+    parser.add_argument(
+        "--translate-window",
+        type=int,
+        default=None,
+        metavar="N",
+        help="OCR N images, then translate their unique strings in batched requests "
+        "(0 = the whole tree at once)",
+    )
+    parser.add_argument(
+        "--translator",
+        choices=sorted(BACKENDS),
+        default=None,
+        help="translation backend (default: google)",
+    )
+    parser.add_argument(
+        "--translator-url",
+        default=None,
+        help="base URL of a LibreTranslate-compatible server for --translator http",
+    )
+    parser.add_argument(
+        "--font",
+        action="append",
+        default=None,
+        help="TrueType font to render with; repeat to build a fallback chain",
+    )
+    parser.add_argument(
+        "--ocr-tile-size",
+        type=int,
+        default=0,
+        metavar="PX",
+        help="OCR images larger than PX pixels in overlapping PX x PX tiles (default: off)",
+    )
+    parser.add_argument(
+        "--ocr-tile-overlap",
+        type=int,
+        default=DEFAULT_TILE_OVERLAP,
+        metavar="PX",
+        help=f"overlap between neighbouring OCR tiles (default: {DEFAULT_TILE_OVERLAP})",
+    )
+    parser.add_argument(
+        "--ocr-tile-workers",
+        type=int,
+        default=DEFAULT_TILE_WORKERS,
+        help=f"tiles of one image read in parallel, each on its own OCR reader (default: {DEFAULT_TILE_WORKERS})",
+    )
+    parser.add_argument(
+        "--ocr-detect-scale",
+        type=float,
+        default=1,
+        metavar="FACTOR",
+        help="detect text on the image reduced by FACTOR, recognize it on full-resolution "
+        "crops (default: 1, off)",
+    )
+    parser.add_argument(
+        "--erase",
+        choices=ERASE_METHODS,
+        default="flat",
+        help="how erased text is filled: the box background color, interpolation from the "
+        "surrounding pixels, or interpolation smoothed by diffusion (default: flat)",
+    )
+    parser.add_argument(
+        "--erase-tighten",
+        action="store_true",
+        help="erase only the glyph pixels inside each box instead of the whole box",
+    )
+    parser.add_argument(
+        "--fill-spots",
+        nargs="?",
+        const=",".join(str(channel) for channel in SPOT_COLOR),
+        default=None,
+        metavar="R,G,B",
+        help="after erasing, repaint the pixels of this color (default: white) with the "
+        "image's most common color",
+    )
+    parser.add_argument(
+        "--fill-spots-tolerance",
+        type=int,
+        default=0,
+        help="per-channel distance still matched by --fill-spots (default: 0)",
+    )
+    parser.add_argument(
+        "--hardlink-unchanged",
+        action="store_true",
+        help="hardlink images without Japanese text into the output instead of copying them",
+    )
+    parser.add_argument(
+        "--metrics-log",
+        metavar="PATH",
+        help="append one JSON line of timings and counters per image to PATH",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        metavar="PATH",
+        help="write run totals to PATH in the Prometheus text format (node_exporter textfile)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="show a live progress line with images per second and the ETA",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="do not print the text, translation and colors of every box",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="run images under cProfile and write .pstats, collapsed-stack .folded files "
+        "and a combined top.txt report to a new run-* subdirectory of DIR",
+    )
+    parser.add_argument(
+        "--profile-every",
+        type=int,
+        default=1,
+        metavar="N",
+        help="with --profile, profile one image in N (default: every image)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=30,
+        metavar="N",
+        help="functions listed in the combined --profile report (default: 30)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after translating the stale images, keep running and translate the images "
+        "added to or changed in the input directory (Ctrl-C to stop)",
+    )
+    parser.add_argument(
+        "--watch-settle",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        metavar="SECONDS",
+        help="with --watch, wait until a file has not changed for SECONDS before reading it "
+        f"(default: {DEFAULT_SETTLE_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--watch-polling",
+        action="store_true",
+        help="with --watch, poll the input directory instead of using inotify "
+        "(for network shares, where other hosts' writes raise no events)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render every image, even those the manifest says are up to date",
+    )
+    args = parser.parse_args(argv)
+    if args.translator == "http" and not args.translator_url:
+        parser.error("--translator http needs --translator-url")
+    if args.pipeline and args.workers > 1:
+        parser.error("--pipeline runs in a single process and cannot be combined with --workers")
+    if args.translate_window is not None and (args.pipeline or args.workers > 1):
+        parser.error("--translate-window cannot be combined with --pipeline or --workers")
+    if args.profile and (args.pipeline or args.translate_window is not None):
+        # cProfile only sees the thread that enabled it; these modes spread an image over threads
+        parser.error("--profile cannot be combined with --pipeline or --translate-window")
+    if args.watch and (args.pipeline or args.translate_window is not None):
+        parser.error("--watch cannot be combined with --pipeline or --translate-window")
+    if args.profile_every < 1:
+        parser.error("--profile-every must be at least 1")
+    if args.fill_spots is not None:
+        try:
+            fill_spots = tuple(int(channel) for channel in args.fill_spots.split(","))
+        except ValueError:
+            fill_spots = ()
+        if len(fill_spots) != 3 or not all(0 <= channel <= 255 for channel in fill_spots):
+            parser.error("--fill-spots expects a color as R,G,B with channels from 0 to 255")
+        args.fill_spots = fill_spots
+    if args.ocr_detect_scale < 1:
+        parser.error("--ocr-detect-scale must be at least 1")
+    if args.ocr_tile_size and args.ocr_tile_overlap >= args.ocr_tile_size:
+        parser.error("--ocr-tile-overlap must be smaller than --ocr-tile-size")
+    input_root, output_root = Path(args.input).resolve(), Path(args.output).resolve()
+    if input_root == output_root or input_root in output_root.parents or output_root in input_root.parents:
+        # Outputs would overwrite their inputs or be read back as inputs
+        parser.error("--input and --output must be separate directories, neither inside the other")
+
+    with run_settings():
+        return run(args)
+
+
+def run(args):
+    """Translate ``args.input`` into ``args.output`` as parsed by ``main``."""
+    # Every setting is written on each run, so none is left over from a previous
+    # run in the same process; workers inherit them through the environment
+    configure_tiling(args.ocr_tile_size, args.ocr_tile_overlap, args.ocr_tile_workers)
+    configure_detect_scale(args.ocr_detect_scale)
+    configure_erase(args.erase, args.erase_tighten)
+    configure_fill_spots(args.fill_spots, args.fill_spots_tolerance)
+    os.environ[HARDLINK_UNCHANGED_ENV] = "1" if args.hardlink_unchanged else ""
+    os.environ[QUIET_ENV] = "1" if args.quiet else ""
+    profile_directory = configure_profiling(args.profile, args.profile_every)
+    # The font and translator may also come from TRANSLATE_IMAGES_FONT and
+    # TRANSLATE_IMAGES_TRANSLATOR; run_settings restores those afterwards
+    if args.font:
+        configure_fonts(args.font)
+    if args.translator:
+        configure_backend(args.translator, args.translator_url)
+
+    # Set input and output directories
+    input_directory = Path(args.input)
+    output_directory = Path(args.output)
+
+    # Ensure the output directory exists
+    output_directory.mkdir(exist_ok=True)
+
+    # Process each image file in the input directory
+    jobs = iter_image_jobs(input_directory, output_directory)
+
+    # Close the manifest and flush the metrics even when the run is interrupted,
+    # so that the next run resumes from every image recorded so far
+    with contextlib.ExitStack() as cleanup:
+        # Skip images whose output is up to date with their input and configuration
+        manifest = Manifest.for_output_directory(output_directory)
+        cleanup.callback(manifest.close)
+        incremental = IncrementalRun(manifest, run_config(), corrections_version())
+        jobs = list(incremental.stale_jobs(jobs, force=args.force))
+        if incremental.skipped:
+            print(f"{incremental.skipped} image(s) already up to date, skipped")
+
+        # Load the OCR models once, before the first image (workers load their own),
+        # unless every output is already up to date
+        if args.workers <= 1 and (jobs or args.watch):
+            warm_up()
+        recorder = MetricsRecorder(
+            jsonl_path=args.metrics_log,
+            prom_path=args.metrics_prom,
+            # A daemon has no end to estimate
+            total=None if args.watch else len(jobs),
+            progress=args.progress,
+        )
+        cleanup.callback(recorder.close)
+
+        def on_result(result, latency=None):
+            incremental.on_result(result)
+            recorder.on_result(result, latency)
+
+        batch_translator = None
+        if args.watch:
+            print(f"Watching {input_directory} for new images (Ctrl-C to stop)")
+            # Files touched without a change of content are skipped like in a re-run
+            failed = watch_directory(
+                process_images,
+                input_directory,
+                output_directory,
+                initial_jobs=jobs,
+                workers=args.workers,
+                threads_per_worker=args.threads_per_worker,
+                settle=args.watch_settle,
+                polling=args.watch_polling,
+                select_jobs=incremental.stale_jobs,
+                on_result=on_result,
+                on_idle=recorder.flush,
+            )
+            # Errors were printed as they happened; the totals are in the metrics summary
+            results = None
+        elif args.translate_window is not None:
+            batch_translator = BatchTranslator(fetch_translation)
+            results = run_windowed(jobs, args.translate_window, batch_translator, on_result=on_result)
+        elif args.pipeline:
+            stage_workers = {name: getattr(args, f"{name}_workers") for name, _ in active_stages()}
+            results = run_pipeline(
+                jobs, stage_workers, queue_size=args.queue_size, on_result=on_result
+            )
+        else:
+            results = run_batch(
+                process_images,
+                jobs,
+                workers=args.workers,
+                threads_per_worker=args.threads_per_worker,
+                on_result=on_result,
+            )
+
+    if results is not None:
+        failures = [result for result in results if not result.ok]
+        failed = len(failures)
+        for result in failures:
+            print(f"Error processing {result.input_path}: {result.error}")
+        print(f"{len(results) - len(failures)}/{len(results)} images processed")
+        unchanged = sum(result.status == "unchanged" for result in results)
+        if unchanged:
+            print(f"{unchanged} image(s) without Japanese text copied unchanged")
+        print(format_stage_seconds(results))
+    print(recorder.format_summary())
+    if args.workers <= 1:
+        print(format_reader_stats())
+        print(get_ocr_cache().format_stats())
+        print(get_translation_cache().format_stats())
+    if batch_translator is not None:
+        print(batch_translator.format_stats())
+    if profile_directory is not None:
+        report = write_report(profile_directory, args.profile_top)
+        if report is None:
+            print(f"No image was profiled into {profile_directory}")
+        else:
+            print(f"Profiles written to {profile_directory}, combined report: {report}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
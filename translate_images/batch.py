@@ -0,0 +1,163 @@
+"""Directory walking and multi-process batch execution."""
+import os
+import signal
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from translate_images.ocr import warm_up
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# Environment variables read by the BLAS/OpenMP runtimes torch may link against.
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+ImageResult = namedtuple(
+    "ImageResult",
+    "input_path output_path ok error seconds status stage_seconds counters",
+    defaults=("done", None, None),
+)
+# What ``process`` may return to run_job: how the image was handled, the
+# seconds spent in each stage and per-image counters (see metrics.COUNTERS)
+ImageReport = namedtuple("ImageReport", "status stage_seconds counters", defaults=(None,))
+
+
+def is_image_file(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def output_path_for(input_path, input_directory, output_directory):
+    """Where the translation of ``input_path`` goes; creates its directory."""
+    relative = Path(input_path).relative_to(input_directory)
+    output_subdir = Path(output_directory) / relative.parent
+    output_subdir.mkdir(parents=True, exist_ok=True)
+    return output_subdir / relative.name
+
+
+def iter_image_jobs(input_directory, output_directory):
+    """Yield ``(input_path, output_path)`` for every image under ``input_directory``.
+
+    The output tree mirrors the input tree; output subdirectories are created
+    as they are discovered.
+    """
+    input_directory = Path(input_directory)
+    for subdir, _, files in os.walk(input_directory):
+        for file in sorted(files):
+            if is_image_file(file):
+                input_image_path = Path(subdir) / file
+                yield input_image_path, output_path_for(
+                    input_image_path, input_directory, output_directory
+                )
+
+
+def limit_threads(threads):
+    """Cap the intra-op thread pools of this process to ``threads``.
+
+    Must run before torch is imported for the OpenMP variables to apply.
+    """
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+def default_threads_per_worker(workers):
+    return max(1, (os.cpu_count() or 1) // max(workers, 1))
+
+
+def _init_worker(threads):
+    # Forked from the watch daemon, a worker would inherit its SIGTERM handler;
+    # a broken pool terminates its remaining workers with SIGTERM
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    limit_threads(threads)
+    warm_up()
+
+
+def worker_pool(workers, threads_per_worker=None):
+    """Process pool whose workers cap their threads and load the OCR reader once."""
+    if threads_per_worker is None:
+        threads_per_worker = default_threads_per_worker(workers)
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(threads_per_worker,)
+    )
+
+
+def run_job(process, input_path, output_path):
+    """Run ``process(input_path, output_path)`` and capture the outcome.
+
+    ``process`` may return an ``ImageReport``, which is copied into the result.
+    """
+    start = time.perf_counter()
+    try:
+        report = process(input_path, output_path)
+    except Exception as e:
+        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+        return ImageResult(
+            input_path, output_path, False, error, time.perf_counter() - start, "failed"
+        )
+    if report is None:
+        report = ImageReport("done", None)
+    return ImageResult(
+        input_path,
+        output_path,
+        True,
+        None,
+        time.perf_counter() - start,
+        report.status,
+        report.stage_seconds,
+        report.counters,
+    )
+
+
+def format_stage_seconds(results):
+    """One line with the total seconds and image count of every stage."""
+    totals = {}
+    for result in results:
+        for stage, seconds in (result.stage_seconds or {}).items():
+            total = totals.setdefault(stage, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+    if not totals:
+        return "Stages: no timings recorded"
+    return "Stages: " + ", ".join(
+        f"{stage} {seconds:.2f}s/{count} image(s)" for stage, (seconds, count) in totals.items()
+    )
+
+
+def run_batch(process, jobs, workers=1, threads_per_worker=None, on_result=None):
+    """Run ``process`` over ``jobs`` and return one ``ImageResult`` per job, in order.
+
+    With ``workers > 1`` the jobs are spread over a process pool; every worker
+    caps its torch/OpenMP threads and loads its own OCR reader once.
+    ``process`` must be picklable (a module-level function). ``on_result`` is
+    called in this process with each result as soon as it is available.
+    """
+    jobs = list(jobs)
+    if workers <= 1:
+        results = []
+        for input_path, output_path in jobs:
+            result = run_job(process, input_path, output_path)
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+        return results
+
+    with worker_pool(workers, threads_per_worker) as executor:
+        futures = [
+            executor.submit(run_job, process, input_path, output_path)
+            for input_path, output_path in jobs
+        ]
+        if on_result is not None:
+            for future in as_completed(futures):
+                on_result(future.result())
+        return [future.result() for future in futures]
@@ -0,0 +1,35 @@
+"""Per-box records shared by the OCR, translate, erase and render steps."""
+from translate_images.render import get_background_colors
+
+
+class TextBox:
+    """One OCR detection and everything computed for it along the way.
+
+    ``bg_color`` is sampled once from the decoded pixels, before anything is
+    erased, and reused by both erase and render.
+    """
+
+    __slots__ = ("text", "box", "bg_color", "translation")
+
+    def __init__(self, text, box, bg_color=None, translation=None):
+        self.text = text
+        self.box = box
+        self.bg_color = bg_color
+        self.translation = translation
+
+    @property
+    def position(self):
+        return self.box[0][0], self.box[0][1]
+
+    def __repr__(self):
+        return f"TextBox({self.text!r}, {self.box!r}, bg_color={self.bg_color!r})"
+
+
+def make_text_boxes(pixels, text_and_boxes):
+    """Build ``TextBox`` records with their background colors in one batched call."""
+    text_and_boxes = list(text_and_boxes)
+    bg_colors = get_background_colors(pixels, [box for _, box in text_and_boxes])
+    return [
+        TextBox(text, box, bg_color)
+        for (text, box), bg_color in zip(text_and_boxes, bg_colors)
+    ]
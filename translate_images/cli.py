@@ -0,0 +1,91 @@
+"""Command line entry point: ``python -m translate_images <command>``.
+
+``translate``, ``correct`` and ``remove`` forward their options to the tools'
+own ``main`` (run ``<command> --help`` for them); each tool is imported only
+when its command runs, so ``--help`` and the ``cache`` commands start without
+loading NumPy, Pillow, EasyOCR or Tk.
+"""
+import argparse
+import sys
+
+PROG = "python -m translate_images"
+
+
+def run_translate(options):
+    from translate_images.auto_translate import main
+
+    return main(options, prog=f"{PROG} translate")
+
+
+def run_correct(options):
+    from translate_images.manual import main
+
+    return main(options, prog=f"{PROG} correct")
+
+
+def run_remove(options):
+    from translate_images.manual import main
+
+    return main(options, keep_empty=True, prog=f"{PROG} remove")
+
+
+def _caches(args):
+    from translate_images.ocr_cache import get_ocr_cache
+    from translate_images.translation_cache import get_translation_cache
+
+    caches = []
+    if args.ocr or not args.translations:
+        caches.append(("OCR results", get_ocr_cache()))
+    if args.translations or not args.ocr:
+        caches.append(("translations", get_translation_cache()))
+    return caches
+
+
+def run_cache_stats(args):
+    for label, cache in _caches(args):
+        print(f"{label}: {cache.count()} entries in {cache.path}")
+    return 0
+
+
+def run_cache_clear(args):
+    for label, cache in _caches(args):
+        print(f"{label}: removed {cache.clear()} entries from {cache.path}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog=PROG, description="Translate the Japanese text of screenshots and images."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    # add_help=False: "--help" is forwarded to the tool, which documents its options
+    for name, run, help_text in (
+        ("translate", run_translate, "translate every image of a directory tree"),
+        ("correct", run_correct, "review and correct translations by hand"),
+        ("remove", run_remove, "review translations, an emptied field removes the text"),
+    ):
+        command = commands.add_parser(name, help=help_text, add_help=False)
+        command.set_defaults(run=run, forward=True)
+
+    cache = commands.add_parser("cache", help="inspect or clear the OCR and translation caches")
+    cache_commands = cache.add_subparsers(dest="cache_command", metavar="action", required=True)
+    for name, run, help_text in (
+        ("stats", run_cache_stats, "show the number of cached entries"),
+        ("clear", run_cache_clear, "delete the cached entries"),
+    ):
+        action = cache_commands.add_parser(name, help=help_text)
+        action.add_argument("--ocr", action="store_true", help="only the OCR cache")
+        action.add_argument("--translations", action="store_true", help="only the translation cache")
+        action.set_defaults(run=run, forward=False)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    if args.forward:
+        return args.run(extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.run(args)
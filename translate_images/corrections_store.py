@@ -0,0 +1,132 @@
+"""Indexed store for the reviewers' translation corrections.
+
+Corrections live in a SQLite database in WAL mode instead of a JSON file that
+is parsed and rewritten on every save: lookups and inserts hit the primary-key
+index, each submitted page is written in one transaction, and several
+reviewers can work at the same time without overwriting each other. The legacy
+``corrections.json`` is imported once, the first time the store is opened.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CORRECTIONS_DB = "corrections.sqlite3"
+CORRECTIONS_JSON = "corrections.json"
+
+
+class CorrectionsStore:
+    def __init__(self, path=CORRECTIONS_DB, json_path=CORRECTIONS_JSON):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS corrections ("
+            " text TEXT PRIMARY KEY, correction TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        if json_path:
+            self.import_json(json_path)
+
+    def get(self, text, default=None):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT correction FROM corrections WHERE text = ?", (text,)
+            ).fetchone()
+        return default if row is None else row[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM corrections").fetchone()[0]
+
+    def put(self, text, correction):
+        self.put_many({text: correction})
+
+    def put_many(self, corrections):
+        """Insert or update ``{text: correction}`` atomically and bump the version."""
+        if not corrections:
+            return
+        now = time.time()
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO corrections VALUES (?, ?, ?)",
+                    [(text, correction, now) for text, correction in corrections.items()],
+                )
+                connection.execute(
+                    "INSERT INTO meta VALUES ('version', '1') ON CONFLICT(key)"
+                    " DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    @property
+    def version(self):
+        """Incremented by every write; part of the run manifest."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def import_json(self, json_path):
+        """Import a legacy ``corrections.json`` once; existing entries win."""
+        if not os.path.exists(json_path):
+            return 0
+        key = f"imported:{os.path.abspath(json_path)}"
+        with self._lock:
+            if self._connection.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+        with open(json_path, "r", encoding="utf-8") as f:
+            corrections = json.load(f)
+        now = time.time()
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if connection.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                    connection.execute("ROLLBACK")
+                    return 0
+                connection.executemany(
+                    "INSERT OR IGNORE INTO corrections VALUES (?, ?, ?)",
+                    [(text, correction, now) for text, correction in corrections.items()],
+                )
+                connection.execute("INSERT INTO meta VALUES (?, ?)", (key, str(now)))
+                connection.execute(
+                    "INSERT INTO meta VALUES ('version', '1') ON CONFLICT(key)"
+                    " DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return len(corrections)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def corrections_version(path=CORRECTIONS_DB, json_path=CORRECTIONS_JSON):
+    """Identify the corrections an output is rendered with, without creating the store."""
+    if os.path.exists(path):
+        store = CorrectionsStore(path, json_path=None)
+        try:
+            return f"store:{store.version}"
+        finally:
+            store.close()
+    if os.path.exists(json_path):
+        from translate_images.image_io import file_hash
+
+        return f"json:{file_hash(json_path)}"
+    return "none"
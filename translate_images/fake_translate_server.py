@@ -0,0 +1,121 @@
+"""Local stand-in for a LibreTranslate-compatible translation server.
+
+Returns deterministic fake translations after a configurable delay, so the
+translator backends can be benchmarked and tested without network access:
+
+    python -m translate_images.fake_translate_server --port 5005 --latency 0.2
+
+Every line of ``q`` is translated to ``[<target>] <line>``, which keeps
+newline-joined batches splittable.
+"""
+import argparse
+import asyncio
+import random
+import threading
+
+
+def fake_translate(text, target):
+    return "\n".join(f"[{target}] {line}" for line in text.split("\n"))
+
+
+class FakeTranslateServer:
+    """aiohttp server running on its own event loop thread."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, seed=0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._loop = None
+        self._thread = None
+        self._runner = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _delay(self):
+        if self.jitter:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        return self.latency
+
+    async def _translate(self, request):
+        from aiohttp import web
+
+        data = await request.json()
+        self.requests += 1
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        text, target = data.get("q", ""), data.get("target", "en")
+        if isinstance(text, list):
+            translated = [fake_translate(item, target) for item in text]
+        else:
+            translated = fake_translate(text, target)
+        return web.json_response({"translatedText": translated})
+
+    async def _health(self, request):
+        from aiohttp import web
+
+        return web.json_response({"status": "ok", "requests": self.requests})
+
+    async def _start(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post("/translate", self._translate)
+        app.router.add_get("/health", self._health)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the port picked by the OS when port=0
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def start(self):
+        """Start serving in a background thread and return the base URL."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fake-translate", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self.url
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve deterministic fake translations.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random latency")
+    args = parser.parse_args(argv)
+
+    server = FakeTranslateServer(args.host, args.port, args.latency, args.jitter)
+    print(f"Fake translation server on {server.start()} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Font lookup, caching and size fitting.
+
+The font is taken from the first loadable entry of a fallback chain (the
+``TRANSLATE_IMAGES_FONT`` environment variable, then common Windows, Linux and
+macOS locations), so rendering works off Windows too. Loaded faces are cached
+by (path, size) and the size for a box is found by binary search.
+"""
+import functools
+import os
+import threading
+
+from PIL import ImageFont
+
+FONT_ENV = "TRANSLATE_IMAGES_FONT"
+MIN_FONT_SIZE = 8
+# The first size tried is this fraction of the box height
+FONT_HEIGHT_RATIO = 0.8
+
+DEFAULT_FONT_PATHS = (
+    "C:/Windows/Fonts/arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    # Bare names are looked up by Pillow in the system font directories
+    "arial.ttf",
+    "DejaVuSans.ttf",
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def load_font(path, size):
+    """Load ``path`` at ``size`` once; ``path=None`` is Pillow's built-in font."""
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+def font_paths_from_env():
+    value = os.environ.get(FONT_ENV)
+    if not value:
+        return []
+    return [path for path in value.split(os.pathsep) if path]
+
+
+class FontManager:
+    """Resolve a font from ``paths`` once and fit it to boxes.
+
+    When no path can be opened, Pillow's built-in scalable font is used.
+    """
+
+    def __init__(self, paths=None):
+        if paths is None:
+            paths = [*font_paths_from_env(), *DEFAULT_FONT_PATHS]
+        self.paths = list(paths)
+        self._path = None
+        self._resolved = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        with self._lock:
+            if not self._resolved:
+                self._path = self._resolve()
+                self._resolved = True
+            return self._path
+
+    def _resolve(self):
+        for path in self.paths:
+            try:
+                load_font(path, MIN_FONT_SIZE)
+            except OSError:
+                continue
+            return path
+        print("Warning: none of the configured fonts could be opened, using Pillow's default font.")
+        return None
+
+    def get(self, size):
+        return load_font(self.path, size)
+
+    def fits(self, font, text, width, height):
+        _, _, right, bottom = font.getbbox(text)
+        return right <= width and bottom <= height
+
+    def fit(self, box, text, min_size=MIN_FONT_SIZE):
+        """Largest font, at most ``FONT_HEIGHT_RATIO`` of the box height, whose text fits the box.
+
+        Falls back to ``min_size`` when even that overflows.
+        """
+        x1, y1 = box[0]
+        x2, y2 = box[2]
+        width, height = x2 - x1, y2 - y1
+        low, high = min_size, max(int(height * FONT_HEIGHT_RATIO), min_size)
+        best = min_size
+        while low <= high:
+            size = (low + high) // 2
+            if self.fits(self.get(size), text, width, height):
+                best = size
+                low = size + 1
+            else:
+                high = size - 1
+        return self.get(best)
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def configure_fonts(paths):
+    """Put ``paths`` in front of the fallback chain; child processes inherit them."""
+    os.environ[FONT_ENV] = os.pathsep.join(paths)
+    reset_font_manager()
+
+
+def reset_font_manager():
+    """Forget the shared manager so the next use reads the environment again."""
+    global _default_manager
+    with _default_lock:
+        _default_manager = None
+
+
+def get_font_manager():
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = FontManager()
+        return _default_manager
+
+
+def estimate_font_size(box, text):
+    """Font to draw ``text`` into ``box`` with, or None when there is no text."""
+    if text is None:
+        print("Warning: Translated text is None.")
+        return None
+    return get_font_manager().fit(box, text)
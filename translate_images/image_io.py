@@ -0,0 +1,110 @@
+"""Decode an image once and share it between OCR, erase and render."""
+import hashlib
+import os
+import shutil
+
+import numpy as np
+from PIL import Image
+
+_CHUNK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    """Hex digest of the bytes of ``path``."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LoadedImage:
+    """A decoded RGB image.
+
+    ``image`` is the PIL image that erase and render draw on. ``array`` is a
+    NumPy copy of the pixels *as decoded* (``np.asarray`` copies a PIL image),
+    built on first access for OCR and background sampling; it does not follow
+    later drawing on ``image``. ``release_array`` frees it once those are done.
+    """
+
+    def __init__(self, path, image):
+        self.path = path
+        self.image = image
+        self._array = None
+        self._content_hash = None
+
+    @property
+    def array(self):
+        if self._array is None:
+            self._array = np.asarray(self.image)
+        return self._array
+
+    def release_array(self):
+        """Free the pixel copy; ``array`` rebuilds it from ``image`` if needed again."""
+        self._array = None
+
+    @property
+    def content_hash(self):
+        """Hash of the file bytes, or of the pixels for images not read from disk."""
+        if self._content_hash is None:
+            if self.path is not None:
+                self._content_hash = file_hash(self.path)
+            else:
+                digest = hashlib.blake2b(str(self.array.shape).encode(), digest_size=20)
+                digest.update(self.array.tobytes())
+                self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    @property
+    def width(self):
+        return self.image.width
+
+    @property
+    def height(self):
+        return self.image.height
+
+
+def load_image(path):
+    """Decode ``path`` to RGB exactly once."""
+    with Image.open(path) as source:
+        image = source.convert("RGB")
+    return LoadedImage(path, image)
+
+
+def as_loaded_image(image_or_path):
+    if isinstance(image_or_path, LoadedImage):
+        return image_or_path
+    return load_image(image_or_path)
+
+
+def _detach(path):
+    # An output hardlinked to its input must not be overwritten in place
+    if os.path.lexists(path):
+        os.unlink(path)
+
+
+def save_image(image, path):
+    """Encode ``image`` to ``path`` without writing through a hardlink."""
+    if os.path.exists(path) and os.stat(path).st_nlink > 1:
+        _detach(path)
+    image.save(path)
+
+
+def copy_unchanged(input_path, output_path, hardlink=False):
+    """Give ``output_path`` the bytes of ``input_path`` without decoding them.
+
+    Avoids a decode/encode round trip (and JPEG generation loss) for images
+    that have nothing to translate. With ``hardlink`` the output shares the
+    input's inode when the filesystem allows it. Nothing is done when
+    ``output_path`` already is ``input_path``.
+    """
+    if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        return
+    _detach(output_path)
+    if hardlink:
+        try:
+            os.link(input_path, output_path)
+            return
+        except OSError:
+            pass
+    shutil.copyfile(input_path, output_path)
@@ -0,0 +1,106 @@
+"""Run manifest for incremental, resumable batches.
+
+For every output image the manifest records the hash of the input bytes, a
+fingerprint of the configuration it was rendered with (OCR languages, font,
+translator) and the corrections version. A re-run skips outputs whose record
+still matches and redoes the rest. Records are written as soon as each image
+is done, so an interrupted batch resumes where it stopped.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from translate_images.image_io import file_hash
+
+MANIFEST_NAME = ".manifest.sqlite3"
+
+
+def config_fingerprint(config):
+    """Stable short hash of a JSON-serializable configuration mapping."""
+    payload = json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=10).hexdigest()
+
+
+class Manifest:
+    """SQLite-backed record of what each output was rendered from."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outputs ("
+            " output_path TEXT PRIMARY KEY, input_path TEXT NOT NULL,"
+            " input_hash TEXT NOT NULL, config TEXT NOT NULL,"
+            " corrections TEXT NOT NULL, completed_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    @classmethod
+    def for_output_directory(cls, output_directory):
+        return cls(Path(output_directory) / MANIFEST_NAME)
+
+    def is_fresh(self, output_path, input_hash, config, corrections):
+        if not os.path.exists(output_path):
+            return False
+        row = self._connection.execute(
+            "SELECT input_hash, config, corrections FROM outputs WHERE output_path = ?",
+            (str(output_path),),
+        ).fetchone()
+        return row == (input_hash, config, corrections)
+
+    def record(self, input_path, output_path, input_hash, config, corrections):
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?, ?)",
+                (str(output_path), str(input_path), input_hash, config, corrections, time.time()),
+            )
+
+    def forget(self, output_path):
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM outputs WHERE output_path = ?", (str(output_path),)
+            )
+
+    def close(self):
+        self._connection.close()
+
+
+class IncrementalRun:
+    """Filter a job list down to stale outputs and record completions."""
+
+    def __init__(self, manifest, config, corrections):
+        self.manifest = manifest
+        self.config = config_fingerprint(config)
+        self.corrections = corrections
+        self.skipped = 0
+        self._hashes = {}
+
+    def stale_jobs(self, jobs, force=False):
+        """Yield the ``(input_path, output_path)`` jobs that need (re)rendering.
+
+        With ``force`` every job is yielded, but completions are still recorded.
+        """
+        for input_path, output_path in jobs:
+            input_hash = file_hash(input_path)
+            if not force and self.manifest.is_fresh(
+                output_path, input_hash, self.config, self.corrections
+            ):
+                self.skipped += 1
+                continue
+            self._hashes[str(output_path)] = input_hash
+            yield input_path, output_path
+
+    def on_result(self, result):
+        """Record a finished ``ImageResult``; failures are left stale."""
+        input_hash = self._hashes.pop(str(result.output_path), None)
+        if result.ok and input_hash is not None:
+            self.manifest.record(
+                result.input_path, result.output_path, input_hash, self.config, self.corrections
+            )
+        elif not result.ok:
+            self.manifest.forget(result.output_path)
@@ -0,0 +1,318 @@
+"""Outils de révision manuelle : correction et suppression du texte traduit.
+
+``main(keep_empty=False)`` est l'outil de correction, ``main(keep_empty=True)``
+celui de suppression (un champ vidé efface le texte de l'image). Rien n'est
+chargé à l'import : la base des corrections, les modèles OCR et Tk ne sont
+ouverts qu'au lancement de ``main``.
+"""
+import argparse
+import os
+from pathlib import Path
+from PIL import ImageDraw
+import re
+from translate_images.batch import iter_image_jobs
+from translate_images.boxes import make_text_boxes
+from translate_images.corrections_store import CorrectionsStore
+from translate_images.fonts import estimate_font_size
+from translate_images.image_io import LoadedImage, load_image, save_image
+from translate_images.inpaint import erase_settings_from_env
+from translate_images.ocr import format_reader_stats, warm_up
+from translate_images.ocr_cache import get_ocr_cache, read_text_cached
+from translate_images.prefetch import Prefetcher
+from translate_images.render import add_text_outline, erase_text
+from translate_images.translation_cache import get_translation_cache
+from translate_images.translators import get_backend
+
+# Base SQLite des corrections (corrections.json est importé une seule fois)
+CORRECTIONS_FILE = "corrections.json"
+CORRECTIONS_DB = "corrections.sqlite3"
+
+
+# Magasin des corrections, ouvert à la première utilisation et non à l'import
+corrections_store = None
+
+
+# Ouvrir le magasin de corrections (recherche et insertion indexées)
+def load_corrections():
+    global corrections_store
+    if corrections_store is None:
+        corrections_store = CorrectionsStore(CORRECTIONS_DB, json_path=CORRECTIONS_FILE)
+    return corrections_store
+
+
+# Enregistrer les corrections d'une page en une seule transaction, sans écraser
+# celles des autres réviseurs
+def save_corrections(new_corrections):
+    load_corrections().put_many(new_corrections)
+
+
+# Fonction pour vérifier si le texte contient des caractères japonais
+def contains_japanese(text):
+    return bool(
+        re.search(r"[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]", text)
+    )  # Retourne True si des caractères japonais sont trouvés
+
+
+# Fonction pour extraire le texte et les zones de texte d'une image
+def extract_text_from_image(image):
+    results = read_text_cached(
+        image, detail=1, paragraph=False
+    )  # Lire le texte depuis le cache OCR, sinon avec le lecteur EasyOCR partagé
+    text_and_boxes = [
+        (text, box) for box, text, _ in results
+    ]  # Extraire le texte et les coordonnées
+    return text_and_boxes  # Retourner le texte et les zones
+
+
+# Fonction pour interroger le service de traduction configuré (sans cache)
+def fetch_translation(text, src_lang, dest_lang):
+    # Google Translate par défaut, voir TRANSLATE_IMAGES_TRANSLATOR
+    return get_backend().translate(text, src_lang, dest_lang)  # Traduire le texte
+
+
+# Fonction pour traduire le texte japonais en anglais
+def translate_text(text, src_lang="ja", dest_lang="en"):
+    # Si le texte a déjà été corrigé, retourner la traduction corrigée
+    correction = load_corrections().get(text)
+    if correction is not None:
+        print(f"Using learned correction for: {text}")  # Utiliser la correction apprise
+        return correction
+
+    try:
+        # Consulter le cache de traductions avant d'appeler le traducteur
+        return get_translation_cache().translate(
+            text, fetch_translation, src_lang, dest_lang
+        )
+    except Exception as e:
+        print(f"Translation error: {e}")  # Afficher l'erreur de traduction
+        return text  # Retourner le texte original en cas d'erreur
+
+
+# Fonction pour ajuster la couleur du texte en fonction de la couleur de fond
+def adjust_text_color(bg_color):
+    r, g, b = bg_color  # Décomposer la couleur de fond en ses composants RGB
+    if (r * 0.299 + g * 0.587 + b * 0.114) < 128:  # Calculer la luminosité
+        return (255, 255, 255)  # Retourner du blanc si le fond est sombre
+    return (0, 0, 0)  # Retourner du noir sinon
+
+
+# Construit une seule fois la fenêtre de révision et ses lignes réutilisables
+def ouvrir_fenetre_par_lots(root, batch_size=5, prefetch_status=None, keep_empty=False):
+    # Tk n'est importé que lorsqu'une fenêtre est ouverte
+    from translate_images.review_window import ReviewWindow
+
+    return ReviewWindow(
+        root,
+        batch_size=batch_size,
+        on_save=save_corrections,  # Une seule écriture par page soumise
+        keep_empty=keep_empty,  # Si vrai, un champ vidé supprime le texte de l'image
+        prefetch_status=prefetch_status,
+    )
+
+
+# Fonction pour traduire chaque texte qui contient des caractères japonais
+def traduire_textes(text_and_boxes):
+    return [
+        (text, translate_text(text.strip()))
+        for text, _ in text_and_boxes
+        if contains_japanese(text)
+    ]
+
+
+# Fonction pour appliquer les corrections saisies dans la fenêtre de révision
+def manual_adjustments(text_and_boxes, corrections):
+    adjusted_translations = []
+    # Boucle pour ajuster les traductions en fonction des corrections
+    for text, box in text_and_boxes:
+        if contains_japanese(text):
+            # Évalue la traduction seulement si aucune correction n'existe
+            if text in corrections:
+                translated_text = corrections[text]
+            elif corrections:
+                translated_text = translate_text(text.strip())
+            else:
+                translated_text = ""
+            adjusted_translations.append(
+                (text, box, translated_text)
+            )  # Ajoute le texte ajusté à la liste
+
+    #save_corrections(corrections)  # Sauvegarde les corrections dans un fichier
+
+    return adjusted_translations  # Retourne les traductions ajustées
+
+
+# Fonction pour traiter les images avec ajustements
+def process_images_with_adjustments(
+    input_image, output_image_path, adjusted_translations
+):
+    # Réutilise l'image déjà décodée pour l'OCR, sinon l'ouvre depuis le disque
+    if not isinstance(input_image, LoadedImage):
+        # Vérifie si le chemin du fichier d'entrée est valide
+        if not os.path.isfile(input_image):
+            raise FileNotFoundError(f"The file {input_image} does not exist.")
+        input_image = load_image(input_image)
+    image = input_image.image
+
+    # Calcule en une seule passe la couleur de fond de chaque zone, avant l'effacement
+    text_boxes = make_text_boxes(
+        input_image.array, [(text, box) for text, box, _ in adjusted_translations]
+    )
+    for text_box, (_, _, translated_text) in zip(text_boxes, adjusted_translations):
+        text_box.translation = translated_text
+
+    # Efface le texte aux emplacements spécifiés dans adjusted_translations, avec la
+    # méthode choisie par TRANSLATE_IMAGES_ERASE (couleur unie par défaut)
+    method, tighten = erase_settings_from_env()
+    image = erase_text(
+        image,
+        [text_box.box for text_box in text_boxes],
+        [text_box.bg_color for text_box in text_boxes],
+        method,
+        tighten,
+    )
+
+    # Crée un objet de dessin pour ajouter du texte à l'image
+    draw = ImageDraw.Draw(image)
+
+    # Parcourt chaque traduction ajustée pour dessiner le texte sur l'image
+    for text_box in text_boxes:
+        box, translated_text = text_box.box, text_box.translation
+        # Réutilise la couleur de fond calculée avant l'effacement
+        bg_color = text_box.bg_color
+        # Ajuste la couleur du texte pour qu'il soit lisible sur le fond
+        text_color = adjust_text_color(bg_color)
+        # Estime la taille de la police pour le texte traduit
+        font = estimate_font_size(box, translated_text)
+
+        # Ignore si la taille de la police n'a pas pu être déterminée
+        if font is None:
+            continue
+
+        # Si la couleur de fond est noire, ajoute une bordure blanche autour du texte
+        if bg_color == (0, 0, 0):
+            add_text_outline(
+                draw,
+                translated_text,
+                (box[0][0], box[0][1]),
+                font,
+                text_color,
+                (255, 255, 255),  # Couleur de la bordure (blanc)
+            )
+        else:
+            # Dessine le texte traduit sur l'image à la position spécifiée
+            draw.text(
+                (box[0][0], box[0][1]), translated_text, font=font, fill=text_color
+            )
+
+    # Sauvegarde l'image traitée à l'emplacement de sortie spécifié
+    save_image(image, output_image_path)
+
+
+# Prépare une image en arrière-plan : décodage, OCR et traduction
+def preparer_image(job):
+    input_image_path, _ = job
+    loaded_image = load_image(input_image_path)  # Décode l'image une seule fois
+    text_and_boxes = extract_text_from_image(loaded_image)  # Extrait le texte
+    textes_traductions = traduire_textes(text_and_boxes)  # Pré-traduit le texte
+    return loaded_image, text_and_boxes, textes_traductions
+
+
+#======================================MAIN=========================================
+def main(argv=None, keep_empty=False, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Supprimer le texte des images après révision manuelle."
+        if keep_empty
+        else "Corriger manuellement les traductions des images.",
+    )
+    parser.add_argument("--input", default="data_jp", help="dossier des images en japonais (défaut : data_jp)")
+    parser.add_argument("--output", default="data_en", help="dossier des images traduites (défaut : data_en)")
+    parser.add_argument("--batch-size", type=int, default=5, help="textes par page de révision (défaut : 5)")
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=2,
+        help="images préparées à l'avance pendant la révision (défaut : 2)",
+    )
+    args = parser.parse_args(argv)
+    input_root, output_root = Path(args.input).resolve(), Path(args.output).resolve()
+    if input_root == output_root or input_root in output_root.parents or output_root in input_root.parents:
+        # Les images traduites écraseraient les originales ou seraient relues comme entrées
+        parser.error("--input et --output doivent être deux dossiers distincts, l'un hors de l'autre")
+
+    import tkinter as tk
+
+    # Répertoires d'entrée et de sortie
+    input_directory = Path(args.input)  # Dossier contenant les images en japonais
+    output_directory = Path(args.output)  # Dossier pour les images traduites en anglais
+
+    # S'assurer que le répertoire de sortie existe, le crée si nécessaire
+    output_directory.mkdir(exist_ok=True)
+
+    # Ouvrir les corrections et charger les modèles OCR une seule fois, avant la première image
+    load_corrections()
+    warm_up()
+
+    # Liste des images calculée une seule fois ; les images suivantes sont
+    # préparées pendant la révision de l'image courante
+    jobs = list(iter_image_jobs(input_directory, output_directory))
+    prefetcher = Prefetcher(preparer_image, jobs, depth=args.prefetch)
+
+    # Une seule fenêtre et une seule boucle principale pour toutes les images
+    root = tk.Tk()
+    root.geometry("1920x1080")  # Définit la taille de la fenêtre
+    root.protocol("WM_DELETE_WINDOW", root.quit)  # Fermer la fenêtre arrête la révision
+    fenetre = ouvrir_fenetre_par_lots(
+        root, args.batch_size, prefetch_status=prefetcher.status, keep_empty=keep_empty
+    )
+
+    def image_suivante():
+        # Récupère l'image préparée sans bloquer le thread Tk
+        resultat = prefetcher.poll()
+        if resultat is None:
+            if prefetcher.finished:
+                root.quit()  # Toutes les images ont été traitées
+            else:
+                fenetre.wait(prefetcher.status())
+                root.after(100, image_suivante)  # Réessaie quand l'image sera prête
+            return
+
+        input_image_path, output_image_path = resultat.item
+        if resultat.error is not None:
+            print(f"Error processing {input_image_path}: {resultat.error}")
+            root.after_idle(image_suivante)
+            return
+        loaded_image, text_and_boxes, textes_traductions = resultat.value
+
+        # Les corrections saisies depuis le préchargement priment sur la pré-traduction
+        textes_traductions = [
+            (text, load_corrections().get(text, traduction))
+            for text, traduction in textes_traductions
+        ]
+
+        def terminer(corrections):
+            # Ajuste les traductions du texte extrait
+            adjusted_translations = manual_adjustments(text_and_boxes, corrections)
+            # Traite l'image avec les ajustements de texte
+            process_images_with_adjustments(
+                loaded_image, output_image_path, adjusted_translations
+            )
+            root.after_idle(image_suivante)  # Passe à l'image suivante
+
+        fenetre.show(
+            f"Image {resultat.index + 1}:  {input_image_path.name}.",
+            textes_traductions,
+            terminer,
+        )
+
+    root.after_idle(image_suivante)
+    root.mainloop()
+    prefetcher.close()
+    root.destroy()
+
+    # Temps de chargement des modèles comparé au temps d'inférence
+    print(format_reader_stats())
+    print(get_ocr_cache().format_stats())
+    # Succès et échecs du cache de traductions
+    print(get_translation_cache().format_stats())
+    return 0
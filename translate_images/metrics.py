@@ -0,0 +1,230 @@
+"""Per-image metrics for batch runs.
+
+``MetricsRecorder.on_result`` takes every ``ImageResult`` of a run and
+- appends it as one JSON object per line to ``jsonl_path``,
+- keeps run totals that are written to ``prom_path`` in the Prometheus text
+  format (for node_exporter's textfile collector; rewritten atomically at most
+  every ``prom_interval`` seconds and at the end of the run),
+- redraws a progress line with images per second and the ETA.
+
+In watch mode every result also carries the latency from the file's arrival
+in the input directory to its translation being in place, exported as a
+histogram.
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+METRIC_PREFIX = "translate_images"
+# Upper bounds (seconds) of the per-image wall time histogram
+IMAGE_SECONDS_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+# Upper bounds (seconds) of the arrival-to-output latency histogram (watch mode)
+LATENCY_SECONDS_BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 600, 1800)
+COUNTERS = ("boxes", "translation_lookups", "translation_calls", "bytes_written")
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class MetricsRecorder:
+    def __init__(
+        self,
+        jsonl_path=None,
+        prom_path=None,
+        total=None,
+        progress=False,
+        stream=None,
+        prom_interval=10.0,
+    ):
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.total = total
+        self.progress = progress
+        self.stream = stream if stream is not None else sys.stderr
+        self.prom_interval = prom_interval
+        self.started = time.time()
+        self.images = {}
+        self.stage_seconds = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.image_seconds = 0.0
+        self.buckets = [0] * len(IMAGE_SECONDS_BUCKETS)
+        self.latencies = 0
+        self.latency_seconds = 0.0
+        self.max_latency = 0.0
+        self.latency_buckets = [0] * len(LATENCY_SECONDS_BUCKETS)
+        self._lock = threading.Lock()
+        self._log = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+        self._prom_written = 0.0
+
+    @property
+    def done(self):
+        return sum(self.images.values())
+
+    def on_result(self, result, latency=None):
+        """Record ``result``; ``latency`` is the seconds since the file arrived, if known."""
+        counters = result.counters or {}
+        with self._lock:
+            self.images[result.status] = self.images.get(result.status, 0) + 1
+            for stage, seconds in (result.stage_seconds or {}).items():
+                self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            for name in COUNTERS:
+                self.counters[name] += counters.get(name, 0)
+            self.image_seconds += result.seconds
+            for position, bound in enumerate(IMAGE_SECONDS_BUCKETS):
+                if result.seconds <= bound:
+                    self.buckets[position] += 1
+            if latency is not None:
+                self.latencies += 1
+                self.latency_seconds += latency
+                self.max_latency = max(self.max_latency, latency)
+                for position, bound in enumerate(LATENCY_SECONDS_BUCKETS):
+                    if latency <= bound:
+                        self.latency_buckets[position] += 1
+
+            if self._log is not None:
+                record = {
+                    "time": time.time(),
+                    "input": str(result.input_path),
+                    "output": str(result.output_path),
+                    "status": result.status,
+                    "ok": result.ok,
+                    "seconds": round(result.seconds, 6),
+                    "stages": {stage: round(seconds, 6) for stage, seconds in (result.stage_seconds or {}).items()},
+                    **counters,
+                }
+                if latency is not None:
+                    record["latency"] = round(latency, 6)
+                if result.error:
+                    record["error"] = result.error
+                self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._log.flush()
+
+            if self.progress:
+                self._draw_progress()
+            if self.prom_path and time.monotonic() - self._prom_written >= self.prom_interval:
+                self._write_prom()
+
+    def images_per_second(self):
+        elapsed = time.time() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def progress_line(self):
+        done = self.done
+        rate = self.images_per_second()
+        line = f"{done}" if self.total is None else f"{done}/{self.total}"
+        line += f" images, {rate:.2f} img/s"
+        if self.total is not None and rate > 0:
+            line += f", ETA {_format_duration((self.total - done) / rate)}"
+        failed = self.images.get("failed", 0)
+        if failed:
+            line += f", {failed} failed"
+        return line
+
+    def _draw_progress(self):
+        self.stream.write("\r\033[K" + self.progress_line())
+        self.stream.flush()
+
+    def prometheus_text(self):
+        name = METRIC_PREFIX
+        lines = [
+            f"# HELP {name}_images_total Images handled, by outcome.",
+            f"# TYPE {name}_images_total counter",
+        ]
+        for status, count in sorted(self.images.items()):
+            lines.append(f'{name}_images_total{{status="{status}"}} {count}')
+        lines += [
+            f"# HELP {name}_stage_seconds_total Seconds spent in each pipeline stage.",
+            f"# TYPE {name}_stage_seconds_total counter",
+        ]
+        for stage, seconds in sorted(self.stage_seconds.items()):
+            lines.append(f'{name}_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}')
+        lines += [
+            f"# HELP {name}_image_seconds Wall time per image.",
+            f"# TYPE {name}_image_seconds histogram",
+        ]
+        for bound, count in zip(IMAGE_SECONDS_BUCKETS, self.buckets):
+            lines.append(f'{name}_image_seconds_bucket{{le="{bound}"}} {count}')
+        lines += [
+            f'{name}_image_seconds_bucket{{le="+Inf"}} {self.done}',
+            f"{name}_image_seconds_sum {self.image_seconds:.6f}",
+            f"{name}_image_seconds_count {self.done}",
+        ]
+        if self.latencies:
+            lines += [
+                f"# HELP {name}_arrival_to_output_seconds Time from an image arriving in the "
+                "watched directory to its translation being written.",
+                f"# TYPE {name}_arrival_to_output_seconds histogram",
+            ]
+            for bound, count in zip(LATENCY_SECONDS_BUCKETS, self.latency_buckets):
+                lines.append(f'{name}_arrival_to_output_seconds_bucket{{le="{bound}"}} {count}')
+            lines += [
+                f'{name}_arrival_to_output_seconds_bucket{{le="+Inf"}} {self.latencies}',
+                f"{name}_arrival_to_output_seconds_sum {self.latency_seconds:.6f}",
+                f"{name}_arrival_to_output_seconds_count {self.latencies}",
+            ]
+        descriptions = {
+            "boxes": "Japanese text boxes found.",
+            "translation_lookups": "Strings looked up for translation.",
+            "translation_calls": "Strings sent to the translator (cache misses).",
+            "bytes_written": "Bytes of output images written.",
+        }
+        for counter in COUNTERS:
+            lines += [
+                f"# HELP {name}_{counter}_total {descriptions[counter]}",
+                f"# TYPE {name}_{counter}_total counter",
+                f"{name}_{counter}_total {self.counters[counter]}",
+            ]
+        lines += [
+            f"# HELP {name}_images_per_second Throughput of the current run.",
+            f"# TYPE {name}_images_per_second gauge",
+            f"{name}_images_per_second {self.images_per_second():.6f}",
+            f"# HELP {name}_run_start_timestamp_seconds Start of the current run.",
+            f"# TYPE {name}_run_start_timestamp_seconds gauge",
+            f"{name}_run_start_timestamp_seconds {self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _write_prom(self):
+        # Write then rename so the collector never reads a half-written file
+        temporary = f"{self.prom_path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(temporary, self.prom_path)
+        self._prom_written = time.monotonic()
+
+    def flush(self):
+        """Write the Prometheus file now instead of waiting for the interval."""
+        with self._lock:
+            if self.prom_path:
+                self._write_prom()
+
+    def format_summary(self):
+        hits = self.counters["translation_lookups"] - self.counters["translation_calls"]
+        summary = (
+            f"Metrics: {self.done} image(s) in {time.time() - self.started:.1f}s "
+            f"({self.images_per_second():.2f} img/s), {self.counters['boxes']} box(es), "
+            f"{self.counters['translation_calls']} translation call(s), {hits} cache hit(s), "
+            f"{self.counters['bytes_written'] / 1e6:.1f} MB written"
+        )
+        if self.latencies:
+            summary += (
+                f", arrival to output avg {self.latency_seconds / self.latencies:.1f}s "
+                f"(max {self.max_latency:.1f}s)"
+            )
+        return summary
+
+    def close(self):
+        with self._lock:
+            if self.progress:
+                self._draw_progress()
+                self.stream.write("\n")
+                self.stream.flush()
+            if self.prom_path:
+                self._write_prom()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
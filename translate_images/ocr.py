@@ -0,0 +1,93 @@
+"""EasyOCR reader registry.
+
+Building an ``easyocr.Reader`` loads the detection and recognition weights from
+disk, which on CPU costs more than reading a single image. Readers are built
+once per (languages, options) and reused for the rest of the process.
+"""
+import threading
+import time
+
+DEFAULT_LANGUAGES = ("ja", "en")
+
+_readers = {}
+_lock = threading.Lock()
+_stats = {
+    "loads": 0,
+    "load_seconds": 0.0,
+    "inferences": 0,
+    "inference_seconds": 0.0,
+}
+
+
+def _reader_key(languages, options):
+    return tuple(languages), tuple(sorted(options.items()))
+
+
+def get_reader(languages=DEFAULT_LANGUAGES, slot=0, **options):
+    """Return the shared reader for ``languages``, building it on first use.
+
+    ``options`` are forwarded to ``easyocr.Reader`` (``gpu``, ``model_storage_directory``...)
+    and are part of the registry key. EasyOCR does not promise that a reader
+    can be used from several threads at once: a ``slot`` above 0 returns another
+    reader with the same settings, for callers that keep one per thread.
+    """
+    key = _reader_key(languages, options) + (slot,)
+    reader = _readers.get(key)
+    if reader is not None:
+        return reader
+
+    with _lock:
+        reader = _readers.get(key)
+        if reader is None:
+            import easyocr
+
+            start = time.perf_counter()
+            reader = easyocr.Reader(list(languages), **options)
+            elapsed = time.perf_counter() - start
+            _readers[key] = reader
+            _stats["loads"] += 1
+            _stats["load_seconds"] += elapsed
+    return reader
+
+
+def warm_up(languages=DEFAULT_LANGUAGES, **options):
+    """Load a reader ahead of time so the first image does not pay for it."""
+    return get_reader(languages, **options)
+
+
+def readtext(image_np, languages=DEFAULT_LANGUAGES, reader_options=None, slot=0, **kwargs):
+    """Run ``readtext`` on the shared reader (or the one of ``slot``) and record the inference time."""
+    reader = get_reader(languages, slot, **(reader_options or {}))
+    start = time.perf_counter()
+    results = reader.readtext(image_np, **kwargs)
+    record_inference(time.perf_counter() - start)
+    return results
+
+
+def record_inference(seconds):
+    """Count one image read outside ``readtext`` (e.g. separate detect/recognize)."""
+    with _lock:
+        _stats["inferences"] += 1
+        _stats["inference_seconds"] += seconds
+
+
+def reader_stats():
+    with _lock:
+        stats = dict(_stats)
+    stats["readers"] = len(_readers)
+    # Every inference beyond the first per reader would have rebuilt it before.
+    avg_load = stats["load_seconds"] / stats["loads"] if stats["loads"] else 0.0
+    stats["saved_seconds"] = max(stats["inferences"] - stats["loads"], 0) * avg_load
+    return stats
+
+
+def format_reader_stats():
+    stats = reader_stats()
+    avg_inference = (
+        stats["inference_seconds"] / stats["inferences"] if stats["inferences"] else 0.0
+    )
+    return (
+        f"OCR: {stats['loads']} reader load(s) in {stats['load_seconds']:.2f}s, "
+        f"{stats['inferences']} inference(s) in {stats['inference_seconds']:.2f}s "
+        f"(avg {avg_inference:.2f}s), ~{stats['saved_seconds']:.2f}s of reloads avoided"
+    )
@@ -0,0 +1,181 @@
+"""Persistent OCR result cache.
+
+``readtext`` results (boxes, text and confidence) are stored in a SQLite file
+keyed by the hash of the image bytes plus the reader configuration, so moving
+between the batch and the manual tools does not OCR the same image
+twice. The least recently used entries are evicted beyond ``max_entries``;
+WAL mode makes the file safe to share between concurrent processes.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from translate_images.ocr import DEFAULT_LANGUAGES, readtext
+from translate_images.ocr_tiling import needs_tiling, read_text_tiled, tiling_from_env
+from translate_images.translation_cache import CACHE_DIR
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("TRANSLATE_IMAGES_OCR_CACHE_ENTRIES", 50000))
+
+
+def _to_python(value):
+    # EasyOCR returns NumPy scalars inside boxes
+    return value.item()
+
+
+def reader_config_key(languages, reader_options, readtext_options):
+    return json.dumps(
+        {
+            "languages": list(languages),
+            "reader": reader_options or {},
+            "readtext": readtext_options,
+        },
+        sort_keys=True,
+    )
+
+
+class OcrCache:
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path if path is not None else CACHE_DIR / "ocr.sqlite3"
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        # A connection inherited through fork() must not be reused.
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ocr ("
+                " image_hash TEXT NOT NULL, config TEXT NOT NULL, results TEXT NOT NULL,"
+                " last_used REAL NOT NULL, PRIMARY KEY (image_hash, config))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ocr_last_used ON ocr (last_used)")
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, image_hash, config):
+        """Return the cached ``[(box, text, confidence), ...]`` or None."""
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT results FROM ocr WHERE image_hash = ? AND config = ?",
+                (image_hash, config),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with connection:
+                connection.execute(
+                    "UPDATE ocr SET last_used = ? WHERE image_hash = ? AND config = ?",
+                    (time.time(), image_hash, config),
+                )
+            self.hits += 1
+        return [tuple(result) for result in json.loads(row[0])]
+
+    def put(self, image_hash, config, results):
+        payload = json.dumps(
+            [[box, text, confidence] for box, text, confidence in results],
+            ensure_ascii=False,
+            default=_to_python,
+        )
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO ocr VALUES (?, ?, ?, ?)",
+                    (image_hash, config, payload, time.time()),
+                )
+                connection.execute(
+                    "DELETE FROM ocr WHERE rowid IN (SELECT rowid FROM ocr"
+                    " ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def count(self):
+        """Number of images whose OCR results are stored."""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM ocr").fetchone()[0]
+
+    def clear(self):
+        """Forget every stored result; returns how many there were."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return connection.execute("DELETE FROM ocr").rowcount
+
+    def format_stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return f"OCR cache: {hits} hit(s), {misses} miss(es)"
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_ocr_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = OcrCache()
+        return _default_cache
+
+
+def read_text_cached(image, languages=DEFAULT_LANGUAGES, reader_options=None, cache=None, **kwargs):
+    """``readtext`` through the OCR cache; returns ``[(box, text, confidence), ...]``.
+
+    ``image`` is a ``LoadedImage`` or a path. ``kwargs`` go to ``readtext`` and
+    are part of the cache key. Images larger than the configured tile size (see
+    ``ocr_tiling.configure_tiling``) are read tile by tile; otherwise, with a
+    detection scale above 1 (see ``ocr_downscale.configure_detect_scale``), text
+    is detected on a reduced copy. Either mode is then part of the key too.
+    """
+    # NumPy and Pillow are only needed once an image is actually read, so that
+    # cache-only commands start without them
+    from translate_images.image_io import as_loaded_image
+    from translate_images.ocr_downscale import detect_scale_from_env, read_text_downscaled
+
+    image = as_loaded_image(image)
+    cache = cache if cache is not None else get_ocr_cache()
+    tile_size, overlap, workers = tiling_from_env()
+    tiled = needs_tiling(image.width, image.height, tile_size)
+    detect_scale = detect_scale_from_env()
+    if tiled:
+        options = dict(kwargs, tiling=[tile_size, overlap])
+    elif detect_scale > 1:
+        options = dict(kwargs, detect_scale=detect_scale)
+    else:
+        options = kwargs
+    config = reader_config_key(languages, reader_options, options)
+    results = cache.get(image.content_hash, config)
+    if results is None:
+        if tiled:
+            results = read_text_tiled(
+                image.array, tile_size, overlap, workers, languages, reader_options, **kwargs
+            )
+        elif detect_scale > 1:
+            results = [
+                (box, text, confidence)
+                for box, text, confidence in read_text_downscaled(
+                    image, detect_scale, languages, reader_options, **kwargs
+                )
+            ]
+        else:
+            results = [
+                (box, text, confidence)
+                for box, text, confidence in readtext(
+                    image.array, languages, reader_options, **kwargs
+                )
+            ]
+        cache.put(image.content_hash, config, results)
+    return results
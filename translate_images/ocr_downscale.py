@@ -0,0 +1,114 @@
+"""Two-resolution OCR: detect on a downscaled image, recognize at full size.
+
+On large screenshots EasyOCR spends most of its time in the CRAFT detector,
+whose cost grows with the pixel count, while text regions stay easy to find at
+a half or a quarter of the resolution. The detector therefore runs on a copy
+reduced by ``factor`` (JPEGs are decoded straight at the reduced size with
+Pillow's ``draft``), its boxes are scaled back up, and only those boxes are
+cropped from the full-resolution pixels for the recognizer.
+"""
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from translate_images.ocr import DEFAULT_LANGUAGES, get_reader, record_inference
+
+DETECT_SCALE_ENV = "TRANSLATE_IMAGES_OCR_DETECT_SCALE"
+
+# readtext() options consumed by Reader.detect; the rest go to Reader.recognize
+DETECT_OPTIONS = frozenset(
+    {
+        "min_size",
+        "text_threshold",
+        "low_text",
+        "link_threshold",
+        "canvas_size",
+        "mag_ratio",
+        "slope_ths",
+        "ycenter_ths",
+        "height_ths",
+        "width_ths",
+        "add_margin",
+        "optimal_num_chars",
+        "threshold",
+        "bbox_min_score",
+        "bbox_min_size",
+        "max_candidates",
+    }
+)
+# EasyOCR's default, in full-resolution pixels
+DEFAULT_MIN_SIZE = 20
+
+
+def configure_detect_scale(factor):
+    """Detect text on images reduced by ``factor`` (1 disables the mode).
+
+    Stored in the environment so batch worker processes inherit it.
+    """
+    if factor < 1:
+        raise ValueError("The detection downscale factor must be at least 1")
+    os.environ[DETECT_SCALE_ENV] = str(factor)
+
+
+def detect_scale_from_env():
+    return float(os.environ.get(DETECT_SCALE_ENV, 1))
+
+
+def detection_image(loaded, factor):
+    """``loaded`` reduced by ``factor`` as an RGB array.
+
+    JPEG files are re-read with ``draft``, which lets the decoder skip the
+    discarded DCT coefficients instead of decoding every pixel and resizing.
+    """
+    size = (max(round(loaded.width / factor), 1), max(round(loaded.height / factor), 1))
+    image = None
+    if loaded.path is not None:
+        with Image.open(loaded.path) as source:
+            if source.format == "JPEG":
+                # draft() picks the smallest 1/2, 1/4 or 1/8 scale still >= size
+                source.draft("RGB", size)
+                image = source.convert("RGB")
+    if image is None:
+        image = loaded.image
+    if image.size != size:
+        image = image.resize(size, Image.BILINEAR)
+    return np.asarray(image)
+
+
+def _scale_boxes(horizontal_list, free_list, sx, sy):
+    horizontal = [
+        [round(x_min * sx), round(x_max * sx), round(y_min * sy), round(y_max * sy)]
+        for x_min, x_max, y_min, y_max in horizontal_list
+    ]
+    free = [[[round(x * sx), round(y * sy)] for x, y in box] for box in free_list]
+    return horizontal, free
+
+
+def read_text_downscaled(loaded, factor, languages=DEFAULT_LANGUAGES, reader_options=None, **kwargs):
+    """``readtext`` with detection at ``1/factor`` resolution.
+
+    Returns ``[(box, text, confidence), ...]`` in full-resolution coordinates,
+    like ``readtext(..., detail=1)``.
+    """
+    reader = get_reader(languages, **(reader_options or {}))
+    detect_options = {key: value for key, value in kwargs.items() if key in DETECT_OPTIONS}
+    recognize_options = {key: value for key, value in kwargs.items() if key not in DETECT_OPTIONS}
+    # Boxes smaller than min_size full-resolution pixels are still dropped
+    detect_options["min_size"] = max(
+        round(detect_options.get("min_size", DEFAULT_MIN_SIZE) / factor), 1
+    )
+
+    start = time.perf_counter()
+    small = detection_image(loaded, factor)
+    horizontal_list, free_list = reader.detect(small, **detect_options)
+    horizontal, free = _scale_boxes(
+        horizontal_list[0],
+        free_list[0],
+        loaded.width / small.shape[1],
+        loaded.height / small.shape[0],
+    )
+    results = reader.recognize(loaded.array, horizontal, free, **recognize_options)
+    record_inference(time.perf_counter() - start)
+    return results
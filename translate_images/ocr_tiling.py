@@ -0,0 +1,172 @@
+"""Tiled OCR for very large images.
+
+Full-page scans and posters above ~8000 px either exhaust memory in
+``readtext`` or get downscaled internally until small text is lost. Here the
+image is cut into overlapping tiles (NumPy views, no copies), the tiles are
+read one after the other on the shared reader, boxes are shifted back to image
+coordinates, and the duplicates detected twice in the overlap zones are merged.
+
+The decoded image and its pixel array stay in memory as for any other image;
+what tiling bounds is the OCR working memory, which then scales with
+``tile_size``. With ``workers`` above 1 the tiles are read in parallel, each
+thread on a reader of its own (EasyOCR readers are not known to be thread-safe),
+so the working memory and the loaded models are multiplied by ``workers``.
+"""
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from translate_images.ocr import DEFAULT_LANGUAGES, readtext
+
+TILE_SIZE_ENV = "TRANSLATE_IMAGES_OCR_TILE_SIZE"
+TILE_OVERLAP_ENV = "TRANSLATE_IMAGES_OCR_TILE_OVERLAP"
+TILE_WORKERS_ENV = "TRANSLATE_IMAGES_OCR_TILE_WORKERS"
+DEFAULT_TILE_OVERLAP = 256
+DEFAULT_TILE_WORKERS = 1
+# Two boxes are the same detection when this much of the smaller one is covered
+DUPLICATE_COVERAGE = 0.5
+
+
+def configure_tiling(tile_size, overlap=DEFAULT_TILE_OVERLAP, workers=DEFAULT_TILE_WORKERS):
+    """Tile images larger than ``tile_size`` px (0 disables tiling).
+
+    Stored in the environment so batch worker processes inherit it.
+    """
+    if tile_size and overlap >= tile_size:
+        raise ValueError("The tile overlap must be smaller than the tile size")
+    os.environ[TILE_SIZE_ENV] = str(tile_size)
+    os.environ[TILE_OVERLAP_ENV] = str(overlap)
+    os.environ[TILE_WORKERS_ENV] = str(workers)
+
+
+def tiling_from_env():
+    """Return ``(tile_size, overlap, workers)``; ``tile_size`` 0 means disabled."""
+    return (
+        int(os.environ.get(TILE_SIZE_ENV, 0)),
+        int(os.environ.get(TILE_OVERLAP_ENV, DEFAULT_TILE_OVERLAP)),
+        int(os.environ.get(TILE_WORKERS_ENV, DEFAULT_TILE_WORKERS)),
+    )
+
+
+def needs_tiling(width, height, tile_size):
+    return bool(tile_size) and max(width, height) > tile_size
+
+
+def iter_tiles(width, height, tile_size, overlap=DEFAULT_TILE_OVERLAP):
+    """Yield ``(x0, y0, x1, y1)`` tiles covering the image, ``overlap`` px apart."""
+    if overlap >= tile_size:
+        raise ValueError("The tile overlap must be smaller than the tile size")
+    step = tile_size - overlap
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, step))
+        # Last tile flush with the border instead of a thin sliver
+        positions.append(length - tile_size)
+        return positions
+
+    for y0 in starts(height):
+        for x0 in starts(width):
+            yield x0, y0, min(x0 + tile_size, width), min(y0 + tile_size, height)
+
+
+def _bounds(box):
+    xs = [point[0] for point in box]
+    ys = [point[1] for point in box]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _area(bounds):
+    x0, y0, x1, y1 = bounds
+    return max(x1 - x0, 0) * max(y1 - y0, 0)
+
+
+def _coverage(a, b):
+    """Intersection area over the area of the smaller box."""
+    intersection = _area((max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])))
+    smaller = min(_area(a), _area(b))
+    return intersection / smaller if smaller else 0.0
+
+
+def _intersects(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def merge_detections(per_tile, tiles, coverage=DUPLICATE_COVERAGE):
+    """Drop detections mostly covered by a larger one from a neighbouring tile.
+
+    ``per_tile[i]`` are the detections of ``tiles[i]``, in image coordinates.
+    A line cut by a tile border is detected whole in the neighbouring tile and
+    partially in its own; keeping the largest box keeps the complete one. Only
+    detections of different tiles that both reach into the band where those
+    tiles overlap are compared, so the work grows with the detections near the
+    tile borders, not with the square of all of them.
+    """
+    ranked = []
+    for index, results in enumerate(per_tile):
+        for box, text, confidence in results:
+            bounds = _bounds(box)
+            # The other tiles this box reaches into; it lies inside its own
+            neighbours = {
+                other for other, tile in enumerate(tiles) if other != index and _intersects(bounds, tile)
+            }
+            ranked.append((box, text, confidence, bounds, index, neighbours))
+    ranked.sort(key=lambda detection: (_area(detection[3]), detection[2]), reverse=True)
+
+    kept = []
+    kept_by_tile = [[] for _ in tiles]
+    for detection in ranked:
+        _, _, _, bounds, index, neighbours = detection
+        if all(
+            _coverage(bounds, other[3]) < coverage
+            for tile in neighbours
+            for other in kept_by_tile[tile]
+            if index in other[5]
+        ):
+            kept.append(detection)
+            kept_by_tile[index].append(detection)
+    # Back to reading order: top to bottom, then left to right
+    kept.sort(key=lambda detection: (detection[3][1], detection[3][0]))
+    return [(box, text, confidence) for box, text, confidence, *_ in kept]
+
+
+def read_text_tiled(
+    pixels,
+    tile_size,
+    overlap=DEFAULT_TILE_OVERLAP,
+    workers=DEFAULT_TILE_WORKERS,
+    languages=DEFAULT_LANGUAGES,
+    reader_options=None,
+    **kwargs,
+):
+    """``readtext`` over overlapping tiles; returns ``[(box, text, confidence), ...]``
+    in image coordinates."""
+    height, width = pixels.shape[:2]
+    tiles = list(iter_tiles(width, height, tile_size, overlap))
+
+    # Reader slots: a tile is read on a reader no other thread is using
+    slots = queue.SimpleQueue()
+    for slot in range(min(workers, len(tiles))):
+        slots.put(slot)
+
+    def read_tile(index):
+        x0, y0, x1, y1 = tiles[index]
+        slot = slots.get()
+        try:
+            results = readtext(pixels[y0:y1, x0:x1], languages, reader_options, slot, **kwargs)
+        finally:
+            slots.put(slot)
+        return index, [
+            ([[x + x0, y + y0] for x, y in box], text, confidence) for box, text, confidence in results
+        ]
+
+    per_tile = [None] * len(tiles)
+    if workers > 1 and len(tiles) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-tile") as executor:
+            for index, results in executor.map(read_tile, range(len(tiles))):
+                per_tile[index] = results
+    else:
+        for index in range(len(tiles)):
+            per_tile[index] = read_tile(index)[1]
+    return merge_detections(per_tile, tiles)
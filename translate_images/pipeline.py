@@ -0,0 +1,158 @@
+"""Staged streaming pipeline with bounded queues.
+
+Each stage owns a pool of worker threads and reads from a bounded queue fed by
+the previous stage, so different images can be in different stages at the same
+time (OCR of image N+1 while image N waits on translation) and a slow stage
+blocks its producers instead of letting work pile up in memory.
+
+Threads are enough here: torch, Pillow codecs and socket I/O all release the GIL.
+"""
+import queue
+import threading
+import time
+import traceback
+from collections import namedtuple
+
+PipelineResult = namedtuple("PipelineResult", "index value error seconds")
+
+_DONE = object()
+
+
+class Stage:
+    """A named step of the pipeline run by ``workers`` threads.
+
+    ``func`` takes the item produced by the previous stage and returns the
+    item handed to the next one.
+    """
+
+    def __init__(self, name, func, workers=1, queue_size=None):
+        if workers < 1:
+            raise ValueError(f"Stage {name!r} needs at least one worker")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue_size = queue_size
+
+
+class _Envelope:
+    __slots__ = ("index", "value", "error", "started")
+
+    def __init__(self, index, value):
+        self.index = index
+        self.value = value
+        self.error = None
+        self.started = time.perf_counter()
+
+
+class Pipeline:
+    """Run items through ``stages`` concurrently.
+
+    ``queue_size`` bounds the input queue of every stage that does not set its
+    own. An exception in a stage marks the item as failed; the item skips the
+    remaining stages and is reported with its error.
+    """
+
+    def __init__(self, stages, queue_size=4):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.queue_size = queue_size
+
+    def stream(self, items):
+        """Yield a ``PipelineResult`` per item, in completion order.
+
+        An exception raised by ``items`` itself is re-raised here once the
+        items already fed have been yielded.
+        """
+        queues = [
+            queue.Queue(maxsize=stage.queue_size or self.queue_size) for stage in self.stages
+        ]
+        output = queue.Queue()
+        threads = []
+        feed_error = []
+
+        for position, stage in enumerate(self.stages):
+            inbox = queues[position]
+            if position + 1 < len(self.stages):
+                outbox = queues[position + 1]
+                downstream_workers = self.stages[position + 1].workers
+            else:
+                outbox = output
+                downstream_workers = 1
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for number in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, inbox, outbox, downstream_workers, remaining, lock),
+                    name=f"{stage.name}-{number}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        feeder = threading.Thread(
+            target=self._feed,
+            args=(items, queues[0], self.stages[0].workers, feed_error),
+            name="feeder",
+            daemon=True,
+        )
+        feeder.start()
+
+        while True:
+            envelope = output.get()
+            if envelope is _DONE:
+                break
+            yield PipelineResult(
+                envelope.index,
+                envelope.value,
+                envelope.error,
+                time.perf_counter() - envelope.started,
+            )
+
+        feeder.join()
+        for thread in threads:
+            thread.join()
+        if feed_error:
+            raise feed_error[0]
+
+    def run(self, items):
+        """Run every item and return the results in input order."""
+        return sorted(self.stream(items), key=lambda result: result.index)
+
+    @staticmethod
+    def _feed(items, inbox, workers, error):
+        try:
+            for index, item in enumerate(items):
+                inbox.put(_Envelope(index, item))
+        except BaseException as e:
+            # Handed to stream(), which re-raises it in the consumer's thread
+            error.append(e)
+        finally:
+            # Always stop the workers, or stream() would wait forever
+            for _ in range(workers):
+                inbox.put(_DONE)
+
+    @staticmethod
+    def _work(stage, inbox, outbox, downstream_workers, remaining, lock):
+        while True:
+            envelope = inbox.get()
+            if envelope is _DONE:
+                break
+            if envelope.error is None:
+                try:
+                    envelope.value = stage.func(envelope.value)
+                except Exception as e:
+                    envelope.error = (
+                        f"{stage.name}: "
+                        + "".join(traceback.format_exception_only(type(e), e)).strip()
+                    )
+            outbox.put(envelope)
+
+        # The last worker of a stage to finish tells the next stage to stop.
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            for _ in range(downstream_workers):
+                outbox.put(_DONE)
@@ -0,0 +1,104 @@
+"""Prepare upcoming work on a background thread.
+
+The review GUIs use this to OCR and pre-translate the next images while the
+reviewer is still editing the current one. Results are handed over through a
+thread-safe queue, so the Tk thread only ever blocks when it has caught up.
+"""
+import queue
+import threading
+import traceback
+from collections import namedtuple
+
+PrefetchResult = namedtuple("PrefetchResult", "index item value error")
+
+_DONE = object()
+
+
+class Prefetcher:
+    """Run ``prepare(item)`` at most ``depth`` items ahead of the consumer.
+
+    Iterate over the prefetcher, or ``poll`` it from an event loop, to get one
+    ``PrefetchResult`` per item, in order.
+    """
+
+    def __init__(self, prepare, items, depth=2):
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        self.prepare = prepare
+        self.items = list(items)
+        self.depth = depth
+        self._results = queue.Queue()
+        self._slots = threading.Semaphore(depth)
+        self._closed = threading.Event()
+        self._preparing = None
+        self._ready = 0
+        self._finished = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        for index, item in enumerate(self.items):
+            self._slots.acquire()
+            if self._closed.is_set():
+                break
+            self._preparing = index
+            try:
+                result = PrefetchResult(index, item, self.prepare(item), None)
+            except Exception as e:
+                error = "".join(traceback.format_exception_only(type(e), e)).strip()
+                result = PrefetchResult(index, item, None, error)
+            with self._lock:
+                self._preparing = None
+                self._ready += 1
+            self._results.put(result)
+        self._results.put(_DONE)
+
+    def _take(self, result):
+        with self._lock:
+            self._ready -= 1
+        # Free a slot so the worker starts on the next item
+        self._slots.release()
+        return result
+
+    def __iter__(self):
+        while not self._finished:
+            result = self._results.get()
+            if result is _DONE:
+                self._finished = True
+                return
+            yield self._take(result)
+
+    def poll(self):
+        """Return the next result if it is ready, else None; never blocks.
+
+        Use ``finished`` to tell "not ready yet" from "no items left".
+        """
+        if self._finished:
+            return None
+        try:
+            result = self._results.get_nowait()
+        except queue.Empty:
+            return None
+        if result is _DONE:
+            self._finished = True
+            return None
+        return self._take(result)
+
+    @property
+    def finished(self):
+        return self._finished
+
+    def status(self):
+        """Short human-readable state, for a GUI indicator."""
+        with self._lock:
+            ready, preparing = self._ready, self._preparing
+        if preparing is not None:
+            return f"Prefetch: {ready} ready, preparing image {preparing + 1}/{len(self.items)}"
+        if ready:
+            return f"Prefetch: {ready} ready"
+        return "Prefetch: idle"
+
+    def close(self):
+        self._closed.set()
+        self._slots.release()
@@ -0,0 +1,221 @@
+"""Opt-in cProfile capture of individual images.
+
+With a profile directory configured, ``profile_image`` runs the images it is
+given (all of them, or one in ``every``, picked by a stable hash of the path so
+worker processes agree) under cProfile and writes, per image, into a
+subdirectory of its own for every run:
+
+- ``<name>.pstats``: the raw dump, for ``python -m pstats`` or snakeviz;
+- ``<name>.folded``: collapsed stacks (``a;b;c microseconds``) for
+  flamegraph.pl or speedscope.
+
+cProfile only records caller -> callee edges, not whole stacks, so the stacks
+are rebuilt by splitting every function's own time over its call paths in
+proportion to the time each caller spent in it (as gprof-style tools do).
+The number of call paths grows exponentially with the density of the call
+graph (an ``import`` alone has thousands of functions), so branches worth less
+than ``MIN_STACK_SECONDS`` and paths beyond ``MAX_STACKS`` are not expanded;
+their time is kept on the functions' other stacks.
+
+``write_report`` merges every dump of a run directory into ``top.txt``.
+"""
+import contextlib
+import cProfile
+import hashlib
+import heapq
+import io
+import itertools
+import os
+import pstats
+import re
+import time
+from pathlib import Path
+
+PROFILE_DIR_ENV = "TRANSLATE_IMAGES_PROFILE_DIR"
+PROFILE_EVERY_ENV = "TRANSLATE_IMAGES_PROFILE_EVERY"
+REPORT_NAME = "top.txt"
+# Deeper call paths are cut when rebuilding collapsed stacks
+MAX_STACK_DEPTH = 64
+# Call paths cheaper than this are not expanded further
+MIN_STACK_SECONDS = 1e-6
+# Upper bound on the call paths expanded per profile
+MAX_STACKS = 20000
+
+
+def configure_profiling(directory, every=1):
+    """Profile one image in ``every`` into a new run subdirectory of ``directory``.
+
+    Returns the run directory; workers inherit it through the environment.
+    ``directory`` None turns profiling off.
+    """
+    if directory is None:
+        os.environ[PROFILE_DIR_ENV] = ""
+        return None
+    run_directory = Path(directory) / time.strftime(f"run-%Y%m%d-%H%M%S-{os.getpid()}")
+    run_directory.mkdir(parents=True, exist_ok=True)
+    os.environ[PROFILE_DIR_ENV] = str(run_directory)
+    os.environ[PROFILE_EVERY_ENV] = str(every)
+    return run_directory
+
+
+def profile_settings():
+    """Return ``(directory, every)``, or None when profiling is off."""
+    directory = os.environ.get(PROFILE_DIR_ENV)
+    if not directory:
+        return None
+    return Path(directory), max(int(os.environ.get(PROFILE_EVERY_ENV, 1)), 1)
+
+
+def dump_name(path):
+    """File name stem for the dumps of the image at ``path``."""
+    return re.sub(r"[^\w.-]+", "_", str(path)).strip("_")
+
+
+def is_sampled(path, every):
+    digest = hashlib.blake2b(str(path).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % every == 0
+
+
+@contextlib.contextmanager
+def profile_image(path):
+    """Profile the body of the ``with`` block when ``path`` is sampled."""
+    settings = profile_settings()
+    if settings is None or not is_sampled(path, settings[1]):
+        yield
+        return
+    directory, _ = settings
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        stem = directory / dump_name(path)
+        profiler.dump_stats(f"{stem}.pstats")
+        stats = pstats.Stats(profiler)
+        with open(f"{stem}.folded", "w", encoding="utf-8") as f:
+            for stack, microseconds in collapsed_stacks(stats):
+                f.write(f"{stack} {microseconds}\n")
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins: "<built-in method time.perf_counter>"
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats, min_seconds=MIN_STACK_SECONDS, max_stacks=MAX_STACKS):
+    """Yield ``("root;...;leaf", microseconds)`` rebuilt from a ``pstats.Stats``.
+
+    Call paths are expanded from the entry points, heaviest first, except
+    branches cheaper than ``min_seconds``, deeper than ``MAX_STACK_DEPTH`` or
+    beyond ``max_stacks`` expanded paths. Afterwards every function's stacks are
+    scaled to add up to exactly its own time in the profile: time the walk
+    did not reach goes to the function's heaviest stack (or to the function
+    alone if it was never reached), and recursion counted twice is scaled
+    down. The stacks therefore always add up to the profile total.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            # edge = (primitive calls, calls, own time, cumulative time) via this caller
+            callees.setdefault(caller, []).append((func, edge[3]))
+    # Entry points: functions called by nothing but themselves (profiling may
+    # start inside a recursion), then one function of every cycle that is not
+    # reachable from them
+    roots = [func for func, entry in entries.items() if not set(entry[4]) - {func}]
+    reachable = set()
+    pending = list(roots)
+    for func in entries:
+        if not pending and func not in reachable:
+            roots.append(func)
+            pending.append(func)
+        while pending:
+            current = pending.pop()
+            if current not in reachable:
+                reachable.add(current)
+                pending.extend(callee for callee, _ in callees.get(current, ()))
+
+    # Heaviest branches first, so the path budget goes where the time is. A
+    # frame is (label, parent frame) to share the prefixes of queued paths.
+    folded = {}  # func -> {stack: seconds}
+    order = itertools.count()
+    queue = [(-entries[root][3], next(order), root, 1.0, None, 0) for root in roots]
+    heapq.heapify(queue)
+    visits = 0
+    while queue and visits < max_stacks:
+        _, _, func, share, parent, depth = heapq.heappop(queue)
+        visits += 1
+        _, _, own, cumulative, _ = entries[func]
+        frame = (_label(func), parent)
+        labels = []
+        node = frame
+        while node is not None:
+            labels.append(node[0])
+            node = node[1]
+        if own * share >= min_seconds:
+            stacks = folded.setdefault(func, {})
+            key = ";".join(reversed(labels))
+            stacks[key] = stacks.get(key, 0.0) + own * share
+        if cumulative <= 0 or depth >= MAX_STACK_DEPTH:
+            continue
+        for callee, edge_cumulative in callees.get(func, ()):
+            # Recursion: the callee's time is already counted on this path
+            if _label(callee) in labels:
+                continue
+            callee_cumulative = entries[callee][3]
+            branch = share * edge_cumulative
+            if callee_cumulative > 0 and branch >= min_seconds:
+                heapq.heappush(
+                    queue,
+                    (-branch, next(order), callee, branch / callee_cumulative, frame, depth + 1),
+                )
+
+    totals = {}
+    for func, entry in entries.items():
+        own = entry[2]
+        stacks = folded.get(func)
+        if not stacks:
+            if own > 0:
+                totals[_label(func)] = totals.get(_label(func), 0.0) + own
+            continue
+        credited = sum(stacks.values())
+        if credited > own:
+            scale = own / credited
+            stacks = {key: seconds * scale for key, seconds in stacks.items()}
+        else:
+            heaviest = max(stacks, key=stacks.get)
+            stacks[heaviest] += own - credited
+        for key, seconds in stacks.items():
+            totals[key] = totals.get(key, 0.0) + seconds
+    # Round the running total, not each stack, so that rounding does not drift
+    running = 0.0
+    emitted = 0
+    for stack, seconds in sorted(totals.items()):
+        running += seconds * 1e6
+        microseconds = round(running) - emitted
+        if microseconds:
+            emitted += microseconds
+            yield stack, microseconds
+
+
+def write_report(directory, top=30):
+    """Merge the dumps of the run ``directory`` into ``top.txt``; returns its path or None."""
+    directory = Path(directory)
+    dumps = sorted(directory.glob("*.pstats"))
+    if not dumps:
+        return None
+    buffer = io.StringIO()
+    stats = pstats.Stats(str(dumps[0]), stream=buffer)
+    for dump in dumps[1:]:
+        stats.add(str(dump))
+    buffer.write(f"{len(dumps)} profiled image(s)\n")
+    for key, title in (("tottime", "own time"), ("cumulative", "cumulative time")):
+        buffer.write(f"\n=== Top {top} functions by {title} ===\n")
+        stats.sort_stats(key).print_stats(top)
+    path = directory / REPORT_NAME
+    path.write_text(buffer.getvalue(), encoding="utf-8")
+    return path
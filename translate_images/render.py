@@ -0,0 +1,211 @@
+"""Erase and render helpers shared by the three scripts."""
+import math
+import os
+
+import numpy as np
+from PIL import Image
+
+from translate_images.inpaint import box_labels, fill_masked, tighten_labels
+
+# Padding (in pixels) around a box when sampling its background color
+BACKGROUND_EXTENSION = 10
+# Used when a box lies completely outside the image
+DEFAULT_BACKGROUND = (255, 255, 255)
+# Outline drawn around text rendered on black backgrounds
+OUTLINE_WIDTH = 2
+OUTLINE_COLOR = (255, 255, 255)
+# fill_color_spots settings, read from the environment so workers inherit them
+FILL_SPOTS_COLOR_ENV = "TRANSLATE_IMAGES_FILL_SPOTS_COLOR"
+FILL_SPOTS_TOLERANCE_ENV = "TRANSLATE_IMAGES_FILL_SPOTS_TOLERANCE"
+SPOT_COLOR = (255, 255, 255)
+
+
+def pack_rgb(pixels):
+    """Pack an ``(..., 3)`` uint8 array into ``0xRRGGBB`` integers."""
+    pixels = pixels.astype(np.uint32, copy=False)
+    return (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+
+
+def unpack_rgb(value):
+    value = int(value)
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+
+def _padded_region(box, width, height, extension):
+    x1, y1 = (int(coord) for coord in box[0])
+    x2, y2 = (int(coord) for coord in box[2])
+    return (
+        max(0, x1 - extension),
+        max(0, y1 - extension),
+        min(width, x2 + extension),
+        min(height, y2 + extension),
+    )
+
+
+def get_background_colors(pixels, boxes, extension=BACKGROUND_EXTENSION):
+    """Return the most common color around each box, in one batched pass.
+
+    ``pixels`` is an ``(H, W, 3)`` uint8 array. Each box is sampled over its
+    axis-aligned corners ``box[0]``/``box[2]`` padded by ``extension``. The
+    padded regions are packed to integers tagged with the box index, so a single
+    ``np.unique`` call counts the colors of every box at once.
+    """
+    height, width = pixels.shape[:2]
+    keys = []
+    for index, box in enumerate(boxes):
+        x1, y1, x2, y2 = _padded_region(box, width, height, extension)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        region = pack_rgb(pixels[y1:y2, x1:x2]).ravel().astype(np.int64)
+        keys.append(region | (index << 24))
+
+    colors = [DEFAULT_BACKGROUND] * len(boxes)
+    if not keys:
+        return colors
+
+    values, counts = np.unique(np.concatenate(keys), return_counts=True)
+    box_ids = values >> 24
+    # Sort by box, then by decreasing count: the first row of each box is its mode.
+    order = np.lexsort((-counts, box_ids))
+    box_ids, values = box_ids[order], values[order]
+    modes, first = np.unique(box_ids, return_index=True)
+    for index, value in zip(modes, values[first]):
+        colors[int(index)] = unpack_rgb(value & 0xFFFFFF)
+    return colors
+
+
+def get_background_color(image, box, extension=BACKGROUND_EXTENSION):
+    """Most common color around a single box of a PIL image or pixel array."""
+    return get_background_colors(np.asarray(image), [box], extension)[0]
+
+
+def _box_region(box, width, height, padding):
+    """``(x1, y1, x2, y2)`` around ``box``, padded and clipped to the image."""
+    xs = [x for x, _ in box]
+    ys = [y for _, y in box]
+    return (
+        max(math.floor(min(xs)) - padding, 0),
+        max(math.floor(min(ys)) - padding, 0),
+        min(math.ceil(max(xs)) + 1 + padding, width),
+        min(math.ceil(max(ys)) + 1 + padding, height),
+    )
+
+
+def _erase_regions(boxes, width, height, padding=BACKGROUND_EXTENSION):
+    """Group ``boxes`` into disjoint regions; returns ``[(region, box indices), ...]``.
+
+    Boxes whose padded regions overlap share one region, grown until it
+    overlaps no other, so no region contains another region's boxes. Boxes
+    completely outside the image are left out.
+    """
+    groups = []
+    for index, box in enumerate(boxes):
+        region = _box_region(box, width, height, padding)
+        if region[2] > region[0] and region[3] > region[1]:
+            groups.append((region, [index]))
+    merged = True
+    while merged:
+        merged = False
+        for first in range(len(groups)):
+            for second in range(first + 1, len(groups)):
+                (ax1, ay1, ax2, ay2), a_indices = groups[first]
+                (bx1, by1, bx2, by2), b_indices = groups[second]
+                if ax1 < bx2 and bx1 < ax2 and ay1 < by2 and by1 < ay2:
+                    groups[first] = (
+                        (min(ax1, bx1), min(ay1, by1), max(ax2, bx2), max(ay2, by2)),
+                        sorted(a_indices + b_indices),
+                    )
+                    del groups[second]
+                    merged = True
+                    break
+            if merged:
+                break
+    return groups
+
+
+def erase_text(image, bounding_boxes, bg_colors=None, method="flat", tighten=False):
+    """Erase every box from ``image`` in one masked pass; returns a new image.
+
+    ``bg_colors`` are the colors precomputed for ``bounding_boxes``; when
+    omitted they are estimated from ``image`` in one batched call. ``method`` is
+    one of ``inpaint.ERASE_METHODS``; ``tighten`` limits the erased pixels to
+    the glyphs instead of the whole boxes.
+
+    Only the regions around the boxes (see ``_erase_regions``) are converted,
+    masked and pasted back, so a few boxes on a large page cost little more
+    than the boxes themselves. The padding keeps the background sampling and
+    the interpolation sources of every box inside its region, so the result is
+    the same as masking the whole page.
+    """
+    bounding_boxes = [[tuple(point) for point in box] for box in bounding_boxes]
+    if not bounding_boxes:
+        return image
+    erased = image.copy()
+    for (x0, y0, x1, y1), indices in _erase_regions(bounding_boxes, image.width, image.height):
+        boxes = [[(x - x0, y - y0) for x, y in bounding_boxes[index]] for index in indices]
+        pixels = np.asarray(image.crop((x0, y0, x1, y1)))
+        if bg_colors is None:
+            colors = get_background_colors(pixels, boxes)
+        else:
+            colors = [bg_colors[index] for index in indices]
+        labels = box_labels((x1 - x0, y1 - y0), boxes)
+        if tighten:
+            labels = tighten_labels(pixels, labels, colors)
+        erased.paste(Image.fromarray(fill_masked(pixels, labels, colors, method)), (x0, y0))
+    return erased
+
+
+def configure_fill_spots(target=SPOT_COLOR, tolerance=0):
+    """Run ``fill_color_spots`` after erasing, for this process and its workers.
+
+    ``target`` None turns the cleanup off.
+    """
+    os.environ[FILL_SPOTS_COLOR_ENV] = "" if target is None else ",".join(str(channel) for channel in target)
+    os.environ[FILL_SPOTS_TOLERANCE_ENV] = str(tolerance)
+
+
+def fill_spots_from_env():
+    """Return ``(target, tolerance)``, or None when the cleanup is off."""
+    color = os.environ.get(FILL_SPOTS_COLOR_ENV)
+    if not color:
+        return None
+    target = tuple(int(channel) for channel in color.split(","))
+    return target, int(os.environ.get(FILL_SPOTS_TOLERANCE_ENV, 0))
+
+
+def fill_color_spots(image, target=SPOT_COLOR, tolerance=0):
+    """Replace the pixels close to ``target`` by the most common color of ``image``.
+
+    A pixel matches when none of its channels differs from ``target`` by more
+    than ``tolerance``. The histogram is one ``np.unique`` over the packed
+    pixels and the replacement one boolean-mask assignment. Returns a new image.
+    """
+    pixels = np.array(image.convert("RGB"))
+    packed = pack_rgb(pixels)
+    if tolerance:
+        spots = (np.abs(pixels.astype(np.int16) - np.array(target, dtype=np.int16)) <= tolerance).all(axis=2)
+    else:
+        spots = packed == pack_rgb(np.array(target, dtype=np.uint8))
+    if not spots.any():
+        return Image.fromarray(pixels)
+    values, counts = np.unique(packed, return_counts=True)
+    pixels[spots] = unpack_rgb(values[counts.argmax()])
+    return Image.fromarray(pixels)
+
+
+def add_text_outline(
+    draw, text, position, font, color, outline_color=OUTLINE_COLOR, outline_width=OUTLINE_WIDTH
+):
+    """Draw ``text`` with an outline in a single rasterization.
+
+    Pillow strokes the glyphs itself (``stroke_width``/``stroke_fill``) instead
+    of redrawing the text at every offset around ``position``.
+    """
+    draw.text(
+        position,
+        text,
+        font=font,
+        fill=color,
+        stroke_width=outline_width,
+        stroke_fill=outline_color,
+    )
@@ -0,0 +1,195 @@
+"""Review window shared by the manual correction and removal tools.
+
+The window is built once: a fixed pool of ``batch_size`` rows (extracted text
+plus an editable translation) is created up front and only refilled when the
+page or the image changes, so a page flip costs the same on page 1 and page
+5000. The tools drive it from a single ``root.mainloop()``; nothing in here
+starts a nested event loop.
+"""
+import tkinter as tk
+from tkinter import font
+
+
+def on_tab(event):
+    # Move to the next field instead of inserting a tab character
+    event.widget.tk_focusNext().focus()
+    return "break"
+
+
+class _Row:
+    """Widgets of one extracted text / translation pair."""
+
+    def __init__(self, parent, position, bold_font):
+        self.label_frame = tk.Frame(parent)
+        self.label_frame.grid(row=2 * position, column=0, pady=(20, 10), padx=10)
+        tk.Label(
+            self.label_frame,
+            text="Jap_Text: ",
+            fg="#FFFFFF",
+            bg="#A9A9A9",
+            font=("Arial", 10),
+        ).pack(side="left")
+        self.label_extrait = tk.Label(
+            self.label_frame,
+            fg="#000000",
+            bg="#D3F3D3",
+            font=("Arial", 12),
+            width=100,
+            wraplength=800,
+        )
+        self.label_extrait.pack(side="left")
+
+        self.frame_traduction = tk.Frame(parent)
+        self.frame_traduction.grid(row=2 * position + 1, column=0, pady=(0, 10), padx=10)
+        tk.Label(
+            self.frame_traduction,
+            text="Translation: ",
+            fg="#FFFFFF",
+            bg="#A9A9A9",
+            font=("Arial", 10),
+        ).pack(side="left")
+        self.text_widget = tk.Text(
+            self.frame_traduction, width=100, height=2, font=bold_font, wrap="word"
+        )
+        self.text_widget.pack(pady=(0, 10), padx=10)
+        self.text_widget.bind("<Tab>", on_tab)
+
+    def fill(self, texte_extrait, traduction):
+        self.label_extrait.config(text=texte_extrait)
+        self.text_widget.delete("1.0", tk.END)
+        self.text_widget.insert(tk.END, traduction)
+        self.label_frame.grid()
+        self.frame_traduction.grid()
+
+    def hide(self):
+        self.label_frame.grid_remove()
+        self.frame_traduction.grid_remove()
+
+    def get(self):
+        return self.text_widget.get("1.0", tk.END).strip()
+
+
+class ReviewWindow:
+    """Paged review of ``(extracted text, proposed translation)`` pairs.
+
+    ``show`` loads one image's pairs; when the last page is submitted,
+    ``on_done(corrections)`` is called with the reviewed translation of every
+    pair. ``on_save(page_corrections)`` receives the edits of each submitted
+    page, once per page. With ``keep_empty`` an emptied field counts as an
+    edit (the removal tool uses it to delete text); otherwise it keeps the
+    proposed translation.
+    """
+
+    def __init__(self, root, batch_size=5, on_save=None, keep_empty=False, prefetch_status=None):
+        self.root = root
+        self.batch_size = batch_size
+        self.on_save = on_save
+        self.keep_empty = keep_empty
+        self.prefetch_status = prefetch_status
+        self.textes_traductions = []
+        self.corrections = {}
+        self.current_index = 0
+        self.on_done = None
+
+        root.configure(bg="#f0f0f0")
+        bold_font = font.Font(family="Arial", size=13, weight="bold")
+
+        rows_frame = tk.Frame(root)
+        rows_frame.pack()
+        self.rows = [_Row(rows_frame, position, bold_font) for position in range(batch_size)]
+
+        self.pagination_label = tk.Label(root, font=("Arial", 10))
+        self.pagination_label.pack(pady=(0, 10))
+        self.prefetch_label = tk.Label(root, fg="#555555", font=("Arial", 9))
+        if prefetch_status is not None:
+            self.prefetch_label.pack(pady=(0, 10))
+            self._refresh_prefetch()
+
+        navigation_frame = tk.Frame(root)
+        navigation_frame.pack(pady=10)
+        self.previous_button = tk.Button(
+            navigation_frame,
+            text="Previous",
+            command=lambda: self.navigate(-1),
+            font=("Arial", 12),
+        )
+        self.previous_button.pack(side="left", padx=(0, 200), fill="x", expand=True)
+        self.submit_button = tk.Button(
+            navigation_frame,
+            text="Submit correction",
+            command=self.submit,
+            font=("Arial", 12),
+        )
+        self.submit_button.pack(side="left", padx=(200, 0), fill="x", expand=True)
+        root.bind("<Return>", lambda event: self.submit())
+
+        self.wait("")
+
+    def _refresh_prefetch(self):
+        self.prefetch_label.config(text=self.prefetch_status())
+        self.root.after(500, self._refresh_prefetch)
+
+    def wait(self, message):
+        """Show an empty window while the next image is being prepared."""
+        self.on_done = None
+        self.root.title(message or "Waiting for the next image...")
+        for row in self.rows:
+            row.hide()
+        self.pagination_label.config(text="")
+        self.previous_button.config(state=tk.DISABLED)
+        self.submit_button.config(state=tk.DISABLED)
+
+    def show(self, title, textes_traductions, on_done):
+        self.root.title(title)
+        self.textes_traductions = list(textes_traductions)
+        self.corrections = {}
+        self.current_index = 0
+        self.on_done = on_done
+        self.submit_button.config(state=tk.NORMAL)
+        self._render_page()
+
+    def _page(self):
+        return self.textes_traductions[self.current_index : self.current_index + self.batch_size]
+
+    def _render_page(self):
+        if self.current_index >= len(self.textes_traductions):
+            on_done, self.on_done = self.on_done, None
+            if on_done is not None:
+                on_done(self.corrections)
+            return
+
+        page = self._page()
+        for row, (texte_extrait, traduction) in zip(self.rows, page):
+            row.fill(texte_extrait, traduction)
+        for row in self.rows[len(page) :]:
+            row.hide()
+        if page:
+            self.rows[0].text_widget.focus_set()
+
+        total = len(self.textes_traductions)
+        self.pagination_label.config(
+            text=f"Page {self.current_index // self.batch_size + 1} / {(total - 1) // self.batch_size + 1}"
+        )
+        self.previous_button.config(state=tk.DISABLED if self.current_index == 0 else tk.NORMAL)
+
+    def submit(self):
+        if self.on_done is None:
+            return
+        corrections_page = {}
+        for row, (texte_extrait, traduction_proposee) in zip(self.rows, self._page()):
+            correction = row.get()
+            if correction != traduction_proposee and (correction or self.keep_empty):
+                self.corrections[texte_extrait] = correction
+                corrections_page[texte_extrait] = correction
+            else:
+                self.corrections[texte_extrait] = traduction_proposee
+        if self.on_save is not None:
+            self.on_save(corrections_page)
+        self.current_index += self.batch_size
+        self._render_page()
+
+    def navigate(self, direction):
+        if self.on_done is None:
+            return
+        self.current_index = max(0, self.current_index + direction * self.batch_size)
+        self._render_page()
@@ -0,0 +1,153 @@
+"""Deduplicated, batched translation of many OCR strings at once.
+
+The same UI labels show up thousands of times across a corpus. Instead of one
+request per box, the strings of a whole window of images are normalized,
+deduplicated, looked up in the translation cache, and the remaining ones are
+sent in chunks: every chunk is joined with newlines into a single request and
+split back afterwards.
+"""
+import threading
+
+from translate_images.translation_cache import get_translation_cache, normalize_text
+
+# Google's web endpoint rejects payloads above 5000 characters
+DEFAULT_MAX_CHARS = 4500
+DEFAULT_MAX_ITEMS = 100
+SEPARATOR = "\n"
+
+
+def unique_texts(texts):
+    """Normalized texts without duplicates, in first-seen order."""
+    return list(dict.fromkeys(key for key in map(normalize_text, texts) if key))
+
+
+def chunk_texts(texts, max_items=DEFAULT_MAX_ITEMS, max_chars=DEFAULT_MAX_CHARS):
+    """Split ``texts`` into chunks whose joined payload stays within the limits."""
+    chunk, size = [], 0
+    for text in texts:
+        added = len(text) + (len(SEPARATOR) if chunk else 0)
+        if chunk and (len(chunk) >= max_items or size + added > max_chars):
+            yield chunk
+            chunk, size = [], 0
+            added = len(text)
+        chunk.append(text)
+        size += added
+    if chunk:
+        yield chunk
+
+
+class BatchTranslator:
+    """Resolve many strings with as few requests as possible.
+
+    ``fetch(text, src_lang, dest_lang)`` performs one request, the same
+    callable the translation cache uses. Resolved translations are written to
+    the cache, so per-box lookups afterwards are cache hits.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        cache=None,
+        src_lang="ja",
+        dest_lang="en",
+        max_items=DEFAULT_MAX_ITEMS,
+        max_chars=DEFAULT_MAX_CHARS,
+    ):
+        self.fetch = fetch
+        self.cache = cache if cache is not None else get_translation_cache()
+        self.src_lang = src_lang
+        self.dest_lang = dest_lang
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self.occurrences = 0
+        self.unique = 0
+        self.cached = 0
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def resolve(self, texts, fetched=None):
+        """Return ``{normalized text: translation}`` for every string in ``texts``.
+
+        Strings whose request failed are left out; callers fall back to their
+        per-string path for those. The normalized texts translated by a request
+        rather than the cache are added to the set ``fetched``, if given.
+        """
+        texts = [text for text in texts if text]
+        keys = unique_texts(texts)
+        resolved = {}
+        missing = []
+        for key in keys:
+            translation = self.cache.get(key, self.src_lang, self.dest_lang)
+            if translation is None:
+                missing.append(key)
+            else:
+                resolved[key] = translation
+
+        requests = failures = 0
+        for chunk in chunk_texts(missing, self.max_items, self.max_chars):
+            translations, chunk_requests = self._fetch_chunk(chunk)
+            requests += chunk_requests
+            pairs = [
+                (key, translation) for key, translation in zip(chunk, translations) if translation is not None
+            ]
+            failures += len(chunk) - len(pairs)
+            if not pairs:
+                continue
+            self.cache.put_many(pairs, self.src_lang, self.dest_lang)
+            resolved.update(pairs)
+            if fetched is not None:
+                fetched.update(key for key, _ in pairs)
+
+        with self._lock:
+            self.occurrences += len(texts)
+            self.unique += len(keys)
+            self.cached += len(keys) - len(missing)
+            self.requests += requests
+            self.failures += failures
+        return resolved
+
+    def _fetch_chunk(self, chunk):
+        """Return ``(translations, requests)``; a failed string's translation is None."""
+        try:
+            translated = self.fetch(SEPARATOR.join(chunk), self.src_lang, self.dest_lang)
+        except Exception as e:
+            print(f"Translation error: {e}")
+            return [None] * len(chunk), 1
+        lines = translated.split(SEPARATOR) if translated else []
+        if len(lines) == len(chunk):
+            return [line.strip() for line in lines], 1
+
+        # The provider merged or split lines: translate this chunk one string at a
+        # time, keeping what succeeded when one of them fails.
+        translations = []
+        for text in chunk:
+            try:
+                translations.append(self.fetch(text, self.src_lang, self.dest_lang))
+            except Exception as e:
+                print(f"Translation error: {e}")
+                translations.append(None)
+        return translations, 1 + len(chunk)
+
+    @staticmethod
+    def lookup(resolved, text):
+        return resolved.get(normalize_text(text))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "occurrences": self.occurrences,
+                "unique": self.unique,
+                "cached": self.cached,
+                "requests": self.requests,
+                "failures": self.failures,
+                "requests_avoided": max(self.occurrences - self.requests, 0),
+            }
+
+    def format_stats(self):
+        stats = self.stats()
+        return (
+            f"Batched translation: {stats['occurrences']} string(s), {stats['unique']} unique, "
+            f"{stats['cached']} already cached, {stats['requests']} request(s) sent, "
+            f"{stats['requests_avoided']} request(s) avoided"
+        )
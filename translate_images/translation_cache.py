@@ -0,0 +1,168 @@
+"""Persistent translation cache.
+
+Translations are keyed by (source language, target language, normalized text).
+A bounded in-memory LRU sits in front of a SQLite file so repeated strings are
+served without a network call, across runs and across the three scripts.
+Human corrections are handled by the callers and always win over this cache.
+"""
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("TRANSLATE_IMAGES_CACHE_DIR", ".cache"))
+DEFAULT_MAX_ENTRIES = 10000
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Canonical form used in cache keys (NFKC, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class TranslationCache:
+    """LRU memory cache backed by a SQLite store.
+
+    Safe to use from several threads; every process opens its own SQLite
+    connection, and WAL mode lets concurrent processes read while one writes.
+    """
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path) if path is not None else CACHE_DIR / "translations.sqlite3"
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        # A connection inherited through fork() must not be reused.
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " src TEXT NOT NULL, dest TEXT NOT NULL, text TEXT NOT NULL,"
+                " translation TEXT NOT NULL, PRIMARY KEY (src, dest, text))"
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key, translation):
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text, src_lang="ja", dest_lang="en"):
+        """Return the cached translation of ``text`` or None."""
+        key = (src_lang, dest_lang, normalize_text(text))
+        with self._lock:
+            translation = self._memory.get(key)
+            if translation is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return translation
+            row = self._connect().execute(
+                "SELECT translation FROM translations WHERE src = ? AND dest = ? AND text = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, text, translation, src_lang="ja", dest_lang="en"):
+        self.put_many([(text, translation)], src_lang, dest_lang)
+
+    def put_many(self, pairs, src_lang="ja", dest_lang="en"):
+        """Store ``(text, translation)`` pairs in a single transaction."""
+        rows = [
+            (src_lang, dest_lang, normalize_text(text), translation)
+            for text, translation in pairs
+            if translation is not None
+        ]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows
+                )
+            for src, dest, text, translation in rows:
+                self._remember((src, dest, text), translation)
+
+    def translate(self, text, fetch, src_lang="ja", dest_lang="en"):
+        """Return the cached translation, or call ``fetch(text, src, dest)`` and store it.
+
+        Exceptions raised by ``fetch`` propagate and nothing is cached.
+        """
+        translation = self.get(text, src_lang, dest_lang)
+        if translation is None:
+            translation = fetch(text, src_lang, dest_lang)
+            self.put(text, translation, src_lang, dest_lang)
+        return translation
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
+
+    def format_stats(self):
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        rate = stats["hits"] / lookups if lookups else 0.0
+        return (
+            f"Translation cache: {stats['hits']} hit(s) ({stats['disk_hits']} from disk), "
+            f"{stats['misses']} miss(es), hit rate {rate:.0%}"
+        )
+
+    def count(self):
+        """Number of translations stored on disk."""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def clear(self):
+        """Forget every stored translation; returns how many there were."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                removed = connection.execute("DELETE FROM translations").rowcount
+            self._memory.clear()
+            return removed
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_translation_cache():
+    """Process-wide cache shared by every call site."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TranslationCache()
+        return _default_cache
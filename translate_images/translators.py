@@ -0,0 +1,223 @@
+"""Translator backends.
+
+Every backend offers a blocking ``translate`` and an ``async translate_async``.
+``GoogleBackend`` wraps deep_translator as before. ``HttpBackend`` speaks the
+LibreTranslate ``POST /translate`` JSON API over a pooled aiohttp session:
+keep-alive connections are reused, in-flight requests are capped and every
+request has its own timeout. ``translate_images.fake_translate_server`` serves
+the same API locally for offline tests and benchmarks.
+
+The process-wide backend is chosen with ``configure_backend`` or the
+``TRANSLATE_IMAGES_TRANSLATOR`` / ``TRANSLATE_IMAGES_TRANSLATOR_URL``
+environment variables, which worker processes inherit.
+"""
+import asyncio
+import atexit
+import os
+import threading
+
+TRANSLATOR_ENV = "TRANSLATE_IMAGES_TRANSLATOR"
+TRANSLATOR_URL_ENV = "TRANSLATE_IMAGES_TRANSLATOR_URL"
+DEFAULT_TRANSLATOR = "google"
+
+
+class TranslatorBackend:
+    name = None
+
+    def translate(self, text, src_lang="ja", dest_lang="en"):
+        raise NotImplementedError
+
+    async def translate_async(self, text, src_lang="ja", dest_lang="en"):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate, text, src_lang, dest_lang)
+
+    async def translate_many(self, texts, src_lang="ja", dest_lang="en"):
+        """Translate ``texts`` concurrently; failed entries are returned as exceptions."""
+        return await asyncio.gather(
+            *(self.translate_async(text, src_lang, dest_lang) for text in texts),
+            return_exceptions=True,
+        )
+
+    def close(self):
+        pass
+
+
+class GoogleBackend(TranslatorBackend):
+    """deep_translator's GoogleTranslator, one instance per thread and language pair."""
+
+    name = "google"
+
+    def __init__(self):
+        # GoogleTranslator keeps per-request state on the instance
+        self._local = threading.local()
+
+    def translate(self, text, src_lang="ja", dest_lang="en"):
+        translators = getattr(self._local, "translators", None)
+        if translators is None:
+            translators = self._local.translators = {}
+        translator = translators.get((src_lang, dest_lang))
+        if translator is None:
+            from deep_translator import GoogleTranslator
+
+            translator = translators[(src_lang, dest_lang)] = GoogleTranslator(
+                source=src_lang, target=dest_lang
+            )
+        return translator.translate(text)
+
+
+class HttpBackend(TranslatorBackend):
+    """Pooled asyncio client for a LibreTranslate-compatible endpoint."""
+
+    name = "http"
+
+    def __init__(self, url, max_connections=32, max_in_flight=16, timeout=10.0, api_key=None):
+        if not url:
+            raise ValueError("The http translator needs a URL")
+        self.url = url.rstrip("/") + "/translate"
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.api_key = api_key
+        # The session and its semaphore, only ever used on the background loop
+        self._state = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._pid = os.getpid()
+
+    def _check_pid(self):
+        # The session and the loop thread do not survive fork(): start over.
+        if self._pid != os.getpid():
+            self._state = None
+            self._loop = None
+            self._thread = None
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+    def _session(self):
+        import aiohttp
+
+        if self._state is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+            session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._state = (session, asyncio.Semaphore(self.max_in_flight))
+        return self._state
+
+    async def _post(self, text, src_lang, dest_lang):
+        session, in_flight = self._session()
+        payload = {"q": text, "source": src_lang, "target": dest_lang, "format": "text"}
+        if self.api_key:
+            payload["api_key"] = self.api_key
+        async with in_flight:
+            async with session.post(self.url, json=payload) as response:
+                response.raise_for_status()
+                data = await response.json()
+        return data["translatedText"]
+
+    async def translate_async(self, text, src_lang="ja", dest_lang="en"):
+        """Awaitable from any loop; the request itself runs on the backend's own loop.
+
+        Keeping every request on one loop gives one session, which ``close`` shuts.
+        """
+        self._check_pid()
+        loop = self._background_loop()
+        future = asyncio.run_coroutine_threadsafe(self._post(text, src_lang, dest_lang), loop)
+        return await asyncio.wrap_future(future)
+
+    def _background_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="http-translator", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def translate(self, text, src_lang="ja", dest_lang="en"):
+        """Blocking call routed through a background loop, so sync callers share the pool."""
+        self._check_pid()
+        future = asyncio.run_coroutine_threadsafe(
+            self._post(text, src_lang, dest_lang), self._background_loop()
+        )
+        return future.result()
+
+    async def _close_session(self):
+        state, self._state = self._state, None
+        if state is not None:
+            await state[0].close()
+
+    async def aclose(self):
+        """``close`` for ``translate_async`` callers, without blocking their loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self):
+        self._check_pid()
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close_session(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    HttpBackend.name: HttpBackend,
+}
+
+_default_backend = None
+_default_lock = threading.Lock()
+
+
+def create_backend(name, **options):
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown translator {name!r}, expected one of {', '.join(sorted(BACKENDS))}"
+        ) from None
+    return backend_class(**options)
+
+
+def configure_backend(name, url=None):
+    """Select the process-wide backend; child processes inherit the choice."""
+    os.environ[TRANSLATOR_ENV] = name
+    if url:
+        os.environ[TRANSLATOR_URL_ENV] = url
+    reset_backend()
+    return get_backend()
+
+
+def reset_backend():
+    """Close the shared backend so the next use reads the environment again."""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is not None:
+            _default_backend.close()
+        _default_backend = None
+
+
+def get_backend():
+    """The process-wide backend, built from the environment on first use."""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            name = os.environ.get(TRANSLATOR_ENV, DEFAULT_TRANSLATOR)
+            options = {}
+            if name == HttpBackend.name:
+                options["url"] = os.environ.get(TRANSLATOR_URL_ENV)
+            _default_backend = create_backend(name, **options)
+        return _default_backend
+
+
+@atexit.register
+def _close_default_backend():
+    if _default_backend is not None:
+        _default_backend.close()
@@ -0,0 +1,248 @@
+"""Watch-folder daemon: translate images as they are dropped into a directory.
+
+watchdog (inotify on Linux) reports every created, modified or moved-in
+image. A file is only queued once it has *settled*: no event for ``settle``
+seconds and the same size and modification time on two checks that far apart,
+so images still being copied in are not read half-written. Hidden files are
+ignored, which covers the ``.name.XXXX`` temporaries of rsync and most upload
+tools until they are renamed to their final name.
+
+Settled images go to workers that stay up for the life of the daemon, with the
+OCR reader loaded once. Each output is written to a hidden temporary file next
+to its final path and renamed over it, so consumers of the output directory
+never see a partial image. A file changed while it is being translated is
+queued again once the first translation is done.
+"""
+import functools
+import os
+import queue
+import signal
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from translate_images.batch import ImageResult, is_image_file, output_path_for, run_job, worker_pool
+
+DEFAULT_SETTLE_SECONDS = 2.0
+# How often pending files are checked and finished jobs collected
+POLL_SECONDS = 0.25
+
+
+def temporary_output_path(output_path):
+    """Hidden sibling of ``output_path`` with the same extension (Pillow picks the format from it)."""
+    output_path = Path(output_path)
+    return output_path.with_name(f".{output_path.stem}.{os.getpid()}.tmp{output_path.suffix}")
+
+
+def write_atomically(process, input_path, output_path):
+    """Run ``process(input_path, temporary)`` and rename the result to ``output_path``."""
+    temporary = temporary_output_path(output_path)
+    try:
+        report = process(input_path, temporary)
+        os.replace(temporary, output_path)
+    finally:
+        if os.path.lexists(temporary):
+            os.unlink(temporary)
+    return report
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class PendingFile:
+    def __init__(self, arrived):
+        # Wall-clock time of the first event of this version of the file
+        self.arrived = arrived
+        self.last_event = time.monotonic()
+        self.last_stat = None
+
+
+class Debouncer:
+    """Turn a stream of file events into settled paths, oldest first."""
+
+    def __init__(self, settle=DEFAULT_SETTLE_SECONDS):
+        self.settle = settle
+        self.pending = {}
+
+    def touch(self, path, arrived=None):
+        pending = self.pending.get(path)
+        if pending is None:
+            self.pending[path] = PendingFile(arrived if arrived is not None else time.time())
+        else:
+            pending.last_event = time.monotonic()
+
+    def settled(self, now=None, exclude=()):
+        """Remove and return ``[(path, arrived), ...]`` for the files that stopped changing.
+
+        Paths in ``exclude`` (being translated) stay pending. Files that
+        disappeared are dropped.
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        for path, pending in list(self.pending.items()):
+            if path in exclude or now - pending.last_event < self.settle:
+                continue
+            stat = _stat(path)
+            if stat is None:
+                del self.pending[path]
+            elif stat != pending.last_stat:
+                # Checked for the first time, or still growing
+                pending.last_stat = stat
+                pending.last_event = now
+            else:
+                del self.pending[path]
+                ready.append((path, pending.arrived))
+        ready.sort(key=lambda item: item[1])
+        return ready
+
+
+def _stop_on_sigterm(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _event_handler(events, input_directory):
+    from watchdog.events import FileSystemEventHandler
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in ("created", "modified", "moved", "closed"):
+                return
+            path = Path(event.dest_path if event.event_type == "moved" else event.src_path)
+            try:
+                relative = path.relative_to(input_directory)
+            except ValueError:
+                # Moved out of the watched tree
+                return
+            if is_image_file(path.name) and not any(part.startswith(".") for part in relative.parts):
+                events.put((path, time.time()))
+
+    return Handler()
+
+
+def watch_directory(
+    process,
+    input_directory,
+    output_directory,
+    initial_jobs=(),
+    workers=1,
+    threads_per_worker=None,
+    settle=DEFAULT_SETTLE_SECONDS,
+    polling=False,
+    select_jobs=None,
+    on_result=None,
+    on_idle=None,
+):
+    """Translate images arriving in ``input_directory`` until interrupted.
+
+    ``process(input_path, output_path)`` must be picklable, as for
+    ``run_batch``. ``initial_jobs`` (e.g. the images that changed while the
+    daemon was down) are queued at once, as given. ``select_jobs`` filters the
+    settled ``(input_path, output_path)`` jobs, e.g. to skip files touched without a
+    change of content. ``on_result(result, latency)`` is called in this thread
+    with every ``ImageResult`` and the seconds since its file arrived.
+    ``on_idle`` is called whenever the queue drains. A worker process that
+    dies fails the images it had queued and the pool is started again. Returns
+    the number of failed images once a KeyboardInterrupt or SIGTERM stops the
+    daemon.
+    """
+    from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
+
+    input_directory = Path(input_directory).resolve()
+    events = queue.SimpleQueue()
+    debouncer = Debouncer(settle)
+    observer = PollingObserver() if polling else Observer()
+    observer.schedule(_event_handler(events, input_directory), str(input_directory), recursive=True)
+    observer.start()
+
+    def start_executor():
+        # One thread keeps the warm reader of this process; more workers are processes
+        return ThreadPoolExecutor(max_workers=1) if workers <= 1 else worker_pool(workers, threads_per_worker)
+
+    executor = start_executor()
+    task = functools.partial(write_atomically, process)
+    running = {}
+
+    def submit(input_path, output_path, arrived):
+        future = executor.submit(run_job, task, input_path, output_path)
+        running[future] = (input_path, output_path, arrived)
+
+    started = time.time()
+    for input_path, output_path in initial_jobs:
+        submit(Path(input_path).resolve(), output_path, started)
+    failures = 0
+    # Stop the same way on SIGTERM (systemd, docker stop) as on Ctrl-C
+    previous_handler = signal.signal(signal.SIGTERM, _stop_on_sigterm)
+    try:
+        while True:
+            while True:
+                try:
+                    path, arrived = events.get_nowait()
+                except queue.Empty:
+                    break
+                debouncer.touch(path, arrived)
+
+            in_flight = {input_path for input_path, _, _ in running.values()}
+            settled = dict(debouncer.settled(exclude=in_flight))
+            if settled:
+                jobs = [
+                    (path, output_path_for(path, input_directory, output_directory))
+                    for path in settled
+                ]
+                for input_path, output_path in select_jobs(jobs) if select_jobs is not None else jobs:
+                    submit(input_path, output_path, settled[input_path])
+
+            if not running:
+                time.sleep(POLL_SECONDS)
+                continue
+            done, _ = wait(running, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            failed, broken = _collect(done, running, on_result)
+            failures += failed
+            if broken:
+                # Every image still queued on the dead pool fails the same way
+                print("A worker process died, restarting the worker pool")
+                executor.shutdown(wait=False, cancel_futures=True)
+                failures += _collect(list(running), running, on_result)[0]
+                executor = start_executor()
+            if not running and on_idle is not None:
+                on_idle()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        observer.stop()
+        # Let the images already started finish; queued ones are picked up on the next start
+        executor.shutdown(wait=True, cancel_futures=True)
+        observer.join()
+    finished = [future for future in running if not future.cancelled()]
+    return failures + _collect(finished, running, on_result)[0]
+
+
+def _collect(done, running, on_result):
+    """Report the ``done`` futures; returns ``(failures, pool broken)``.
+
+    ``run_job`` catches the errors of ``process``; a future can still fail when
+    its worker process died, which breaks the whole pool.
+    """
+    failures = 0
+    broken = False
+    for future in done:
+        input_path, output_path, arrived = running.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            broken = broken or isinstance(e, BrokenExecutor)
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            result = ImageResult(input_path, output_path, False, error, time.time() - arrived, "failed")
+        failures += not result.ok
+        if not result.ok:
+            print(f"Error processing {result.input_path}: {result.error}")
+        if on_result is not None:
+            on_result(result, time.time() - arrived)
+    return failures, broken